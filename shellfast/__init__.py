@@ -7,8 +7,9 @@ ShellFast uses direct system calls and the C++ standard library, delivering
 significant performance improvements.
 
 Categories:
-    - **File & Directory**: ls, pwd, cd, mkdir, rmdir, rm, touch, cp, mv, ln, find, du, chmod, chown
-    - **Text Processing**: cat, echo, head, tail, grep, sort_file, diff, cmp, comm, wc, cut, paste, join
+    - **File & Directory**: ls, pwd, cd, mkdir, rmdir, rm, touch, cp, mv, ln, find, du, chmod, chown,
+      touch_many, rm_many, stat_many
+    - **Text Processing**: cat, echo, head, tail, grep, grep_multi, sort_file, diff, cmp, comm, wc, cut, paste, join
     - **System Info**: uname, whoami, uptime, env, getenv, export_env, unsetenv, clear, cal, date, sleep, id, groups, free, whereis
     - **Process Management**: ps, kill, killall
     - **Networking**: ping, nslookup, ifconfig
@@ -41,6 +42,9 @@ from shellfast._core import (
     du,
     chmod,
     chown,
+    touch_many,
+    rm_many,
+    stat_many,
 
     # ── Text Processing Commands ──────────────────────────────────────────
     cat,
@@ -48,6 +52,7 @@ from shellfast._core import (
     head,
     tail,
     grep,
+    grep_multi,
     sort_file,
     diff,
     cmp,
@@ -85,13 +90,18 @@ from shellfast._core import (
     ifconfig,
 )
 
+# ── NumPy helpers (optional dependency, imported lazily) ──────────────────
+from shellfast._array import cut_array
+
 __all__ = [
     # File & Directory
     "ls", "pwd", "cd", "mkdir", "rmdir", "rm", "touch",
     "cp", "mv", "ln", "find", "du", "chmod", "chown",
+    "touch_many", "rm_many", "stat_many",
     # Text Processing
-    "cat", "echo", "head", "tail", "grep", "sort_file",
-    "diff", "cmp", "comm", "wc", "cut", "paste", "join",
+    "cat", "echo", "head", "tail", "grep", "grep_multi",
+    "sort_file", "diff", "cmp", "comm", "wc", "cut", "paste", "join",
+    "cut_array",
     # System
     "uname", "whoami", "uptime", "env", "getenv", "export_env",
     "unsetenv", "clear", "cal", "date", "sleep", "id", "groups",
@@ -41,7 +41,14 @@ def touch(path: str, no_create: bool = False) -> None:
     """Create file or update timestamp. Equivalent to ``touch``."""
     ...
 
-def cp(src: str, dst: str, recursive: bool = False, force: bool = False, preserve: bool = False) -> None:
+def cp(
+    src: str,
+    dst: str,
+    recursive: bool = False,
+    force: bool = False,
+    preserve: bool = False,
+    reflink: str = "auto",
+) -> None:
     """Copy files/directories. Equivalent to ``cp``."""
     ...
 
@@ -76,6 +83,18 @@ def chown(path: str, owner: str = "", group: str = "", recursive: bool = False)
     """Change file ownership. Equivalent to ``chown``."""
     ...
 
+def touch_many(paths: List[str], no_create: bool = False) -> None:
+    """Touch many files in one call. Equivalent to ``touch a b ...``."""
+    ...
+
+def rm_many(paths: List[str], recursive: bool = False, force: bool = False) -> None:
+    """Remove many paths in one call. Equivalent to ``rm a b ...``."""
+    ...
+
+def stat_many(paths: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """Status of many paths in one call. Equivalent to ``stat a b ...``."""
+    ...
+
 # ── Text Processing Commands ─────────────────────────────────────────────────
 
 def cat(path: str, number_lines: bool = False, squeeze_blank: bool = False) -> str:
@@ -108,6 +127,12 @@ def grep(
     """Search for pattern in files. Equivalent to ``grep``."""
     ...
 
+def grep_multi(
+    patterns: List[str], path: str, ignore_case: bool = False
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Search a file for several patterns at once. Equivalent to ``grep -e P1 -e P2``."""
+    ...
+
 def sort_file(
     path: str,
     reverse: bool = False,
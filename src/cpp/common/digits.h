@@ -0,0 +1,87 @@
+#pragma once
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+
+namespace sf {
+
+// ---------------------------------------------------------------------------
+// SWAR decimal parsing
+//
+// Eight ASCII digits are validated and combined inside one 64-bit word, with
+// no per-byte branch (see "SWAR techniques" at 0x80.pl). Words are loaded
+// little-endian, so the first character is always the lowest byte.
+// ---------------------------------------------------------------------------
+
+inline uint64_t load_le64(const char* p) {
+    uint64_t x;
+    std::memcpy(&x, p, 8);
+#if defined(__BYTE_ORDER__) && __BYTE_ORDER__ == __ORDER_BIG_ENDIAN__
+    x = __builtin_bswap64(x);
+#endif
+    return x;
+}
+
+// Decodes a word holding 8 ASCII digits into `out`. Returns false if any
+// byte is not '0'-'9'.
+inline bool parse_8_digits_word(uint64_t x, uint32_t& out) {
+    uint64_t d = x - 0x3030303030303030ULL;
+    // A byte below '0' sets its high bit in d, one above '9' in x + 0x46.
+    if (((x + 0x4646464646464646ULL) | d) & 0x8080808080808080ULL)
+        return false;
+    d = d * 10 + (d >> 8);  // adjacent digit pairs, in every other byte
+    d = (((d & 0x000000FF000000FFULL) * (100 + (1000000ULL << 32))) +
+         (((d >> 16) & 0x000000FF000000FFULL) * (1 + (10000ULL << 32)))) >> 32;
+    out = static_cast<uint32_t>(d);
+    return true;
+}
+
+// Parses exactly 8 digits at p into `out`.
+inline bool parse_8_digits(const char* p, uint32_t& out) {
+    return parse_8_digits_word(load_le64(p), out);
+}
+
+// Parses [p, p + n) as an unsigned decimal number of 1-19 digits. Returns
+// false for an empty or too long range, or any non-digit byte. Never reads
+// outside the range.
+inline bool parse_digits(const char* p, size_t n, uint64_t& out) {
+    static constexpr uint32_t kPow10[8] = {
+        1, 10, 100, 1000, 10000, 100000, 1000000, 10000000};
+    if (n == 0 || n > 19)
+        return false;
+
+    uint64_t v = 0;
+    if (n < 8) {
+        // Too short for a word load; a plain loop is cheapest here.
+        for (size_t i = 0; i < n; i++) {
+            unsigned d = static_cast<unsigned char>(p[i]) - '0';
+            if (d > 9)
+                return false;
+            v = v * 10 + d;
+        }
+        out = v;
+        return true;
+    }
+
+    const char* end = p + n;
+    uint32_t chunk;
+    for (; end - p >= 8; p += 8) {
+        if (!parse_8_digits(p, chunk))
+            return false;
+        v = v * 100000000 + chunk;
+    }
+    if (size_t tail = static_cast<size_t>(end - p)) {
+        // Reload the last 8 bytes (overlapping digits already consumed) and
+        // turn the consumed ones into leading '0's.
+        uint64_t x = load_le64(end - 8);
+        uint64_t keep = ~0ULL << (8 * (8 - tail));
+        x = (x & keep) | (0x3030303030303030ULL & ~keep);
+        if (!parse_8_digits_word(x, chunk))
+            return false;
+        v = v * kPow10[tail] + chunk;
+    }
+    out = v;
+    return true;
+}
+
+} // namespace sf
@@ -0,0 +1,107 @@
+#include "common/dir_reader.h"
+
+#include <cerrno>
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+
+#include <dirent.h>
+#include <fcntl.h>
+#include <sys/stat.h>
+#include <sys/syscall.h>
+#include <unistd.h>
+
+namespace sf {
+
+static constexpr size_t kDirBufferSize = 256 * 1024;
+
+int open_dir(const std::string& path) {
+    return ::open(path.c_str(), O_RDONLY | O_DIRECTORY | O_CLOEXEC);
+}
+
+unsigned char mode_to_dtype(mode_t mode) {
+    switch (mode & S_IFMT) {
+        case S_IFREG:  return DT_REG;
+        case S_IFDIR:  return DT_DIR;
+        case S_IFLNK:  return DT_LNK;
+        case S_IFBLK:  return DT_BLK;
+        case S_IFCHR:  return DT_CHR;
+        case S_IFIFO:  return DT_FIFO;
+        case S_IFSOCK: return DT_SOCK;
+        default:       return DT_UNKNOWN;
+    }
+}
+
+static bool is_dot_or_dotdot(const char* name) {
+    return name[0] == '.' && (name[1] == '\0' || (name[1] == '.' && name[2] == '\0'));
+}
+
+static void push_entry(int dirfd, const char* name, unsigned char type,
+                       std::vector<DirEntry>& out) {
+    if (is_dot_or_dotdot(name))
+        return;
+    if (type == DT_UNKNOWN) {
+        struct stat st;
+        if (fstatat(dirfd, name, &st, AT_SYMLINK_NOFOLLOW) == 0)
+            type = mode_to_dtype(st.st_mode);
+        if (type == DT_UNKNOWN)
+            type = DT_REG;
+    }
+    out.push_back({name, type});
+}
+
+#ifdef SYS_getdents64
+
+struct linux_dirent64 {
+    uint64_t       d_ino;
+    int64_t        d_off;
+    unsigned short d_reclen;
+    unsigned char  d_type;
+    char           d_name[];
+};
+
+bool read_dir(int dirfd, std::vector<DirEntry>& out) {
+    // One buffer per thread, reused across calls: recursive walks would
+    // otherwise fault in a fresh 256 KiB allocation for every directory.
+    thread_local std::vector<char> buf(kDirBufferSize);
+
+    for (;;) {
+        long n = syscall(SYS_getdents64, dirfd, buf.data(), buf.size());
+        if (n == 0)
+            return true;
+        if (n < 0) {
+            if (errno == EINTR)
+                continue;
+            return false;
+        }
+        for (long off = 0; off < n;) {
+            auto* d = reinterpret_cast<linux_dirent64*>(buf.data() + off);
+            push_entry(dirfd, d->d_name, d->d_type, out);
+            off += d->d_reclen;
+        }
+    }
+}
+
+#else
+
+bool read_dir(int dirfd, std::vector<DirEntry>& out) {
+    int fd = dup(dirfd);
+    if (fd < 0)
+        return false;
+    DIR* dir = fdopendir(fd);
+    if (!dir) {
+        ::close(fd);
+        return false;
+    }
+    errno = 0;
+    while (struct dirent* d = readdir(dir))
+        push_entry(dirfd, d->d_name, d->d_type, out);
+    int saved = errno;
+    closedir(dir);
+    errno = saved;
+    return saved == 0;
+}
+
+#endif
+
+} // namespace sf
@@ -0,0 +1,36 @@
+#pragma once
+#include "common/unique_fd.h"
+
+#include <string>
+#include <vector>
+
+#include <sys/types.h>
+
+namespace sf {
+
+// ---------------------------------------------------------------------------
+// Directory enumeration via getdents64
+//
+// libc readdir() refills a ~32 KiB buffer per syscall. Reading with
+// getdents64 into a 256 KiB buffer cuts the syscall count on large
+// directories, and the d_type of every record lets callers classify entries
+// without a stat() each.
+// ---------------------------------------------------------------------------
+
+struct DirEntry {
+    std::string name;
+    unsigned char type;  // DT_* constant; never DT_UNKNOWN
+};
+
+// Opens `path` as a directory (O_DIRECTORY | O_CLOEXEC). Returns -1 on error.
+int open_dir(const std::string& path);
+
+// Appends every entry of the open directory `dirfd`, except "." and "..", to
+// `out` in on-disk order. Entries whose filesystem reports DT_UNKNOWN are
+// resolved with fstatat(). Returns false (with errno set) on a read error.
+bool read_dir(int dirfd, std::vector<DirEntry>& out);
+
+// Maps the S_IFMT bits of a stat mode to the matching DT_* constant.
+unsigned char mode_to_dtype(mode_t mode);
+
+} // namespace sf
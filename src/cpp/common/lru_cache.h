@@ -0,0 +1,80 @@
+#pragma once
+
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <mutex>
+#include <shared_mutex>
+#include <string>
+#include <unordered_map>
+
+namespace sf {
+
+// Small string-keyed LRU cache of shared, immutable values (compiled
+// patterns and the like). Safe to use from several threads: hits only take
+// a shared lock and bump the entry's use stamp, so concurrent lookups of
+// cached keys never serialize. Eviction scans for the oldest stamp, which is
+// cheap at the small capacities this is meant for.
+template <typename V>
+class LruCache {
+public:
+    explicit LruCache(size_t capacity) : capacity_(capacity) {}
+
+    // Returns the cached value for `key`, or builds it with `make()` and
+    // caches it. `make` runs outside the lock and may throw, in which case
+    // nothing is cached.
+    template <typename Make>
+    std::shared_ptr<const V> get_or_create(const std::string& key, Make&& make) {
+        {
+            std::shared_lock<std::shared_mutex> lock(mu_);
+            auto it = index_.find(key);
+            if (it != index_.end()) {
+                it->second.last_used.store(tick(), std::memory_order_relaxed);
+                return it->second.value;
+            }
+        }
+
+        std::shared_ptr<const V> value = make();
+
+        std::unique_lock<std::shared_mutex> lock(mu_);
+        auto it = index_.find(key);
+        if (it != index_.end()) {
+            it->second.last_used.store(tick(), std::memory_order_relaxed);
+            return it->second.value;
+        }
+        if (index_.size() >= capacity_)
+            evict_oldest();
+        Entry& e = index_[key];
+        e.value = value;
+        e.last_used.store(tick(), std::memory_order_relaxed);
+        return value;
+    }
+
+private:
+    struct Entry {
+        std::shared_ptr<const V> value;
+        std::atomic<uint64_t> last_used{0};
+    };
+
+    uint64_t tick() { return clock_.fetch_add(1, std::memory_order_relaxed) + 1; }
+
+    // Caller holds the exclusive lock.
+    void evict_oldest() {
+        auto oldest = index_.begin();
+        for (auto it = index_.begin(); it != index_.end(); ++it) {
+            if (it->second.last_used.load(std::memory_order_relaxed) <
+                oldest->second.last_used.load(std::memory_order_relaxed))
+                oldest = it;
+        }
+        if (oldest != index_.end())
+            index_.erase(oldest);
+    }
+
+    size_t capacity_;
+    std::shared_mutex mu_;
+    std::atomic<uint64_t> clock_{0};
+    std::unordered_map<std::string, Entry> index_;
+};
+
+}  // namespace sf
@@ -0,0 +1,119 @@
+#include "common/mapped_file.h"
+
+#include <cerrno>
+#include <utility>
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+namespace sf {
+
+static constexpr size_t kHugePageThreshold = size_t{2} << 30;
+
+MappedFile::~MappedFile() {
+    release();
+}
+
+MappedFile::MappedFile(MappedFile&& other) noexcept {
+    *this = std::move(other);
+}
+
+MappedFile& MappedFile::operator=(MappedFile&& other) noexcept {
+    if (this != &other) {
+        release();
+        mapped_ = other.mapped_;
+        size_ = other.size_;
+        owned_ = std::move(other.owned_);
+        data_ = mapped_ ? other.data_ : owned_.data();
+        other.data_ = nullptr;
+        other.size_ = 0;
+        other.mapped_ = false;
+    }
+    return *this;
+}
+
+void MappedFile::release() {
+    if (mapped_)
+        munmap(const_cast<char*>(data_), size_);
+    data_ = nullptr;
+    size_ = 0;
+    mapped_ = false;
+    owned_.clear();
+}
+
+bool MappedFile::open(const std::string& path, bool populate) {
+    release();
+
+    int fd = ::open(path.c_str(), O_RDONLY | O_CLOEXEC);
+    if (fd < 0)
+        return false;
+
+    struct stat st;
+    if (fstat(fd, &st) != 0) {
+        int saved = errno;
+        ::close(fd);
+        errno = saved;
+        return false;
+    }
+    if (S_ISDIR(st.st_mode)) {
+        ::close(fd);
+        errno = EISDIR;
+        return false;
+    }
+
+    if (S_ISREG(st.st_mode)) {
+        // Every caller reads front to back: ask for a larger readahead
+        // window, and for the whole file to be read in when it will all be
+        // touched anyway. Both are hints; failures are ignored.
+        posix_fadvise(fd, 0, 0, POSIX_FADV_SEQUENTIAL);
+        if (populate)
+            posix_fadvise(fd, 0, 0, POSIX_FADV_WILLNEED);
+    }
+
+    if (S_ISREG(st.st_mode) && st.st_size > 0) {
+        size_t size = static_cast<size_t>(st.st_size);
+        int flags = MAP_PRIVATE | (populate ? MAP_POPULATE : 0);
+        void* p = mmap(nullptr, size, PROT_READ, flags, fd, 0);
+        if (p != MAP_FAILED) {
+            ::close(fd);
+            madvise(p, size, MADV_SEQUENTIAL);
+#ifdef MADV_HUGEPAGE
+            // MAP_HUGETLB only works for hugetlbfs, not for ordinary files;
+            // this lets kernels with file THP back big mappings with huge
+            // pages instead, cutting TLB misses on multi-GiB scans.
+            if (size >= kHugePageThreshold)
+                madvise(p, size, MADV_HUGEPAGE);
+#endif
+            data_ = static_cast<const char*>(p);
+            size_ = size;
+            mapped_ = true;
+            return true;
+        }
+    }
+
+    // Fallback: read whatever the file yields into an owned buffer.
+    char buf[65536];
+    for (;;) {
+        ssize_t r = ::read(fd, buf, sizeof(buf));
+        if (r == 0)
+            break;
+        if (r < 0) {
+            if (errno == EINTR)
+                continue;
+            int saved = errno;
+            ::close(fd);
+            owned_.clear();
+            errno = saved;
+            return false;
+        }
+        owned_.append(buf, static_cast<size_t>(r));
+    }
+    ::close(fd);
+    data_ = owned_.data();
+    size_ = owned_.size();
+    return true;
+}
+
+} // namespace sf
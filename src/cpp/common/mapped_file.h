@@ -0,0 +1,46 @@
+#pragma once
+#include <cstddef>
+#include <string>
+
+namespace sf {
+
+// ---------------------------------------------------------------------------
+// MappedFile — read-only view of a whole file
+//
+// Regular files are mmap'd; anything mmap cannot represent (pseudo-files in
+// /proc that report st_size == 0, FIFOs, character devices) is read into an
+// owned buffer instead, so callers always see one contiguous byte range.
+// ---------------------------------------------------------------------------
+
+class MappedFile {
+public:
+    MappedFile() = default;
+    ~MappedFile();
+
+    MappedFile(const MappedFile&) = delete;
+    MappedFile& operator=(const MappedFile&) = delete;
+    MappedFile(MappedFile&& other) noexcept;
+    MappedFile& operator=(MappedFile&& other) noexcept;
+
+    // Returns false (with errno set) if the path cannot be opened or is a
+    // directory. The file is always advised for sequential access. With
+    // populate, the whole mapping is read in and faulted in up front
+    // (POSIX_FADV_WILLNEED + MAP_POPULATE), which suits callers that are
+    // about to scan every byte.
+    bool open(const std::string& path, bool populate = false);
+
+    const char* data() const { return data_; }
+    size_t size() const { return size_; }
+    const char* begin() const { return data_; }
+    const char* end() const { return data_ + size_; }
+
+private:
+    void release();
+
+    const char* data_ = nullptr;
+    size_t size_ = 0;
+    bool mapped_ = false;
+    std::string owned_;
+};
+
+} // namespace sf
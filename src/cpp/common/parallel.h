@@ -0,0 +1,35 @@
+#pragma once
+#include <algorithm>
+#include <cstddef>
+#include <thread>
+#include <vector>
+
+namespace sf {
+
+// ---------------------------------------------------------------------------
+// parallel_ranges — split independent per-item work over a few threads
+//
+// Calls fn(begin, end) for contiguous chunks covering [0, n), on up to 8
+// threads; the calling thread takes the first chunk. Ranges shorter than
+// `min_parallel` run inline. fn must not throw.
+// ---------------------------------------------------------------------------
+
+template <typename Fn>
+void parallel_ranges(size_t n, size_t min_parallel, Fn&& fn) {
+    unsigned workers = std::min(std::max(std::thread::hardware_concurrency(), 1u), 8u);
+    if (n < min_parallel || workers == 1) {
+        fn(size_t{0}, n);
+        return;
+    }
+
+    size_t chunk = (n + workers - 1) / workers;
+    std::vector<std::thread> threads;
+    for (size_t begin = chunk; begin < n; begin += chunk) {
+        size_t end = std::min(n, begin + chunk);
+        threads.emplace_back([&fn, begin, end] { fn(begin, end); });
+    }
+    fn(size_t{0}, std::min(n, chunk));
+    for (auto& t : threads) t.join();
+}
+
+} // namespace sf
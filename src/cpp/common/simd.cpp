@@ -0,0 +1,422 @@
+#include "common/simd.h"
+
+#include <cstdint>
+#include <cstring>
+
+#if defined(__x86_64__) || defined(__i386__)
+#include <immintrin.h>
+#define SF_HAVE_X86 1
+#endif
+
+namespace sf {
+
+// ---------------------------------------------------------------------------
+// Helpers
+// ---------------------------------------------------------------------------
+
+static inline unsigned char fold_ascii(unsigned char c) {
+    return (c >= 'A' && c <= 'Z') ? static_cast<unsigned char>(c | 0x20) : c;
+}
+
+static bool equal_icase(const char* a, const char* b, size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        if (fold_ascii(static_cast<unsigned char>(a[i])) !=
+            fold_ascii(static_cast<unsigned char>(b[i])))
+            return false;
+    }
+    return true;
+}
+
+static inline bool is_space(unsigned char c) {
+    return c == ' ' || (c >= '\t' && c <= '\r');
+}
+
+// ---------------------------------------------------------------------------
+// find_literal
+// ---------------------------------------------------------------------------
+
+static const char* find_literal_scalar(const char* hay, size_t n,
+                                       const char* needle, size_t m,
+                                       bool ignore_case) {
+    if (!ignore_case)
+        return static_cast<const char*>(memmem(hay, n, needle, m));
+
+    unsigned char first = fold_ascii(static_cast<unsigned char>(needle[0]));
+    for (size_t i = 0; i + m <= n; i++) {
+        if (fold_ascii(static_cast<unsigned char>(hay[i])) == first &&
+            equal_icase(hay + i + 1, needle + 1, m - 1))
+            return hay + i;
+    }
+    return nullptr;
+}
+
+#ifdef SF_HAVE_X86
+// "Generic SIMD" substring search: compare the first and last needle bytes
+// against 32 candidate positions at once and only verify the positions where
+// both agree. For ignore_case, both sides are OR'd with 0x20, which folds
+// ASCII letters but also merges a few punctuation pairs ('@' / '`'), so
+// candidates are always re-verified with a real case-insensitive compare.
+__attribute__((target("avx2")))
+static const char* find_literal_avx2(const char* hay, size_t n,
+                                     const char* needle, size_t m,
+                                     bool ignore_case) {
+    const unsigned char fold = ignore_case ? 0x20 : 0x00;
+    const __m256i vfold = _mm256_set1_epi8(static_cast<char>(fold));
+    const __m256i vfirst = _mm256_set1_epi8(static_cast<char>(needle[0] | fold));
+    const __m256i vlast = _mm256_set1_epi8(static_cast<char>(needle[m - 1] | fold));
+
+    size_t i = 0;
+    for (; i + m - 1 + 32 <= n; i += 32) {
+        __m256i bf = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(hay + i));
+        __m256i bl = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(hay + i + m - 1));
+        bf = _mm256_or_si256(bf, vfold);
+        bl = _mm256_or_si256(bl, vfold);
+        __m256i eq = _mm256_and_si256(_mm256_cmpeq_epi8(vfirst, bf),
+                                      _mm256_cmpeq_epi8(vlast, bl));
+        uint32_t mask = static_cast<uint32_t>(_mm256_movemask_epi8(eq));
+        while (mask) {
+            const char* cand = hay + i + __builtin_ctz(mask);
+            if (ignore_case) {
+                if (equal_icase(cand, needle, m))
+                    return cand;
+            } else if (m <= 2 || std::memcmp(cand + 1, needle + 1, m - 2) == 0) {
+                return cand;
+            }
+            mask &= mask - 1;
+        }
+    }
+
+    if (i + m > n)
+        return nullptr;
+    return find_literal_scalar(hay + i, n - i, needle, m, ignore_case);
+}
+
+// Same scheme as the AVX2 version over 64 candidate positions.
+__attribute__((target("avx512bw,bmi")))
+static const char* find_literal_avx512(const char* hay, size_t n,
+                                       const char* needle, size_t m,
+                                       bool ignore_case) {
+    const unsigned char fold = ignore_case ? 0x20 : 0x00;
+    const __m512i vfold = _mm512_set1_epi8(static_cast<char>(fold));
+    const __m512i vfirst = _mm512_set1_epi8(static_cast<char>(needle[0] | fold));
+    const __m512i vlast = _mm512_set1_epi8(static_cast<char>(needle[m - 1] | fold));
+
+    size_t i = 0;
+    for (; i + m - 1 + 64 <= n; i += 64) {
+        __m512i bf = _mm512_or_si512(_mm512_loadu_si512(hay + i), vfold);
+        __m512i bl = _mm512_or_si512(_mm512_loadu_si512(hay + i + m - 1), vfold);
+        uint64_t mask = _mm512_cmpeq_epi8_mask(vfirst, bf) & _mm512_cmpeq_epi8_mask(vlast, bl);
+        while (mask) {
+            const char* cand = hay + i + __builtin_ctzll(mask);
+            if (ignore_case) {
+                if (equal_icase(cand, needle, m))
+                    return cand;
+            } else if (m <= 2 || std::memcmp(cand + 1, needle + 1, m - 2) == 0) {
+                return cand;
+            }
+            mask &= mask - 1;
+        }
+    }
+
+    if (i + m > n)
+        return nullptr;
+    return find_literal_scalar(hay + i, n - i, needle, m, ignore_case);
+}
+#endif
+
+// ---------------------------------------------------------------------------
+// count_byte / find_all_bytes / count_lines_words
+//
+// The vector kernels compare a whole register against the target byte (and
+// the whitespace set), collapse the result to a bit mask, and popcount it.
+// Word starts are non-whitespace bytes whose predecessor is whitespace; the
+// predecessor mask is the whitespace mask shifted by one, with the last bit
+// of the previous block carried in.
+// ---------------------------------------------------------------------------
+
+static size_t count_byte_scalar(const char* p, size_t n, char c) {
+    size_t count = 0;
+    for (size_t i = 0; i < n; i++)
+        count += p[i] == c;
+    return count;
+}
+
+static void find_all_bytes_scalar(const char* p, size_t n, char c,
+                                  size_t base, std::vector<size_t>& out) {
+    const char* end = p + n;
+    for (const char* q = p; (q = static_cast<const char*>(std::memchr(q, c, end - q))); q++)
+        out.push_back(base + static_cast<size_t>(q - p));
+}
+
+static void find_all_bytes2_scalar(const char* p, size_t n, char a, char b,
+                                   size_t base, std::vector<size_t>& out) {
+    for (size_t i = 0; i < n; i++)
+        if (p[i] == a || p[i] == b)
+            out.push_back(base + i);
+}
+
+static LineWordCounts count_lines_words_scalar(const char* p, size_t n,
+                                               bool prev_space,
+                                               LineWordCounts counts) {
+    for (size_t i = 0; i < n; i++) {
+        unsigned char c = static_cast<unsigned char>(p[i]);
+        bool space = is_space(c);
+        counts.lines += c == '\n';
+        counts.words += !space && prev_space;
+        prev_space = space;
+    }
+    return counts;
+}
+
+#ifdef SF_HAVE_X86
+__attribute__((target("avx2,popcnt")))
+static size_t count_byte_avx2(const char* p, size_t n, char c) {
+    const __m256i vc = _mm256_set1_epi8(c);
+    size_t count = 0, i = 0;
+    for (; i + 32 <= n; i += 32) {
+        __m256i v = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(p + i));
+        uint32_t m = static_cast<uint32_t>(_mm256_movemask_epi8(_mm256_cmpeq_epi8(v, vc)));
+        count += __builtin_popcount(m);
+    }
+    return count + count_byte_scalar(p + i, n - i, c);
+}
+
+__attribute__((target("avx512bw,popcnt")))
+static size_t count_byte_avx512(const char* p, size_t n, char c) {
+    const __m512i vc = _mm512_set1_epi8(c);
+    size_t count = 0, i = 0;
+    for (; i + 64 <= n; i += 64)
+        count += __builtin_popcountll(_mm512_cmpeq_epi8_mask(_mm512_loadu_si512(p + i), vc));
+    return count + count_byte_scalar(p + i, n - i, c);
+}
+
+__attribute__((target("avx2,popcnt,bmi")))
+static void find_all_bytes_avx2(const char* p, size_t n, char c,
+                                std::vector<size_t>& out) {
+    const __m256i vc = _mm256_set1_epi8(c);
+    size_t i = 0;
+    for (; i + 32 <= n; i += 32) {
+        __m256i v = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(p + i));
+        uint32_t m = static_cast<uint32_t>(_mm256_movemask_epi8(_mm256_cmpeq_epi8(v, vc)));
+        while (m) {
+            out.push_back(i + static_cast<size_t>(__builtin_ctz(m)));
+            m &= m - 1;
+        }
+    }
+    find_all_bytes_scalar(p + i, n - i, c, i, out);
+}
+
+__attribute__((target("avx2,popcnt,bmi")))
+static void find_all_bytes2_avx2(const char* p, size_t n, char a, char b,
+                                 std::vector<size_t>& out) {
+    const __m256i va = _mm256_set1_epi8(a);
+    const __m256i vb = _mm256_set1_epi8(b);
+    size_t i = 0;
+    for (; i + 32 <= n; i += 32) {
+        __m256i v = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(p + i));
+        __m256i eq = _mm256_or_si256(_mm256_cmpeq_epi8(v, va), _mm256_cmpeq_epi8(v, vb));
+        uint32_t m = static_cast<uint32_t>(_mm256_movemask_epi8(eq));
+        while (m) {
+            out.push_back(i + static_cast<size_t>(__builtin_ctz(m)));
+            m &= m - 1;
+        }
+    }
+    find_all_bytes2_scalar(p + i, n - i, a, b, i, out);
+}
+
+__attribute__((target("avx2,popcnt")))
+static LineWordCounts count_lines_words_avx2(const char* p, size_t n) {
+    const __m256i nl = _mm256_set1_epi8('\n');
+    const __m256i sp = _mm256_set1_epi8(' ');
+    const __m256i tab = _mm256_set1_epi8('\t');
+    const __m256i four = _mm256_set1_epi8(4);
+    LineWordCounts counts;
+    uint32_t carry = 1;  // start of input behaves like a preceding space
+    size_t i = 0;
+    for (; i + 32 <= n; i += 32) {
+        __m256i v = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(p + i));
+        // '\t'..'\r' are the five bytes with (c - '\t') <= 4 unsigned.
+        __m256i t = _mm256_sub_epi8(v, tab);
+        __m256i ctl = _mm256_cmpeq_epi8(_mm256_min_epu8(t, four), t);
+        __m256i ws = _mm256_or_si256(_mm256_cmpeq_epi8(v, sp), ctl);
+        uint32_t ws_mask = static_cast<uint32_t>(_mm256_movemask_epi8(ws));
+        uint32_t nl_mask = static_cast<uint32_t>(_mm256_movemask_epi8(_mm256_cmpeq_epi8(v, nl)));
+        uint32_t prev_ws = (ws_mask << 1) | carry;
+        counts.lines += __builtin_popcount(nl_mask);
+        counts.words += __builtin_popcount(~ws_mask & prev_ws);
+        carry = ws_mask >> 31;
+    }
+    return count_lines_words_scalar(p + i, n - i, carry != 0, counts);
+}
+
+__attribute__((target("avx512bw,popcnt")))
+static LineWordCounts count_lines_words_avx512(const char* p, size_t n) {
+    const __m512i nl = _mm512_set1_epi8('\n');
+    const __m512i sp = _mm512_set1_epi8(' ');
+    const __m512i tab = _mm512_set1_epi8('\t');
+    const __m512i four = _mm512_set1_epi8(4);
+    LineWordCounts counts;
+    uint64_t carry = 1;
+    size_t i = 0;
+    for (; i + 64 <= n; i += 64) {
+        __m512i v = _mm512_loadu_si512(p + i);
+        uint64_t ws_mask = _mm512_cmpeq_epi8_mask(v, sp) |
+                           _mm512_cmple_epu8_mask(_mm512_sub_epi8(v, tab), four);
+        uint64_t nl_mask = _mm512_cmpeq_epi8_mask(v, nl);
+        uint64_t prev_ws = (ws_mask << 1) | carry;
+        counts.lines += __builtin_popcountll(nl_mask);
+        counts.words += __builtin_popcountll(~ws_mask & prev_ws);
+        carry = ws_mask >> 63;
+    }
+    return count_lines_words_scalar(p + i, n - i, carry != 0, counts);
+}
+#endif
+
+// ---------------------------------------------------------------------------
+// first_mismatch
+// ---------------------------------------------------------------------------
+
+static size_t first_mismatch_scalar(const char* a, const char* b, size_t n) {
+    size_t i = 0;
+    for (; i + 8 <= n; i += 8) {
+        uint64_t x, y;
+        std::memcpy(&x, a + i, 8);
+        std::memcpy(&y, b + i, 8);
+        if (x != y) break;
+    }
+    for (; i < n; i++)
+        if (a[i] != b[i]) return i;
+    return n;
+}
+
+#ifdef SF_HAVE_X86
+__attribute__((target("avx2,bmi")))
+static size_t first_mismatch_avx2(const char* a, const char* b, size_t n) {
+    size_t i = 0;
+    // 64 bytes per iteration; the exact byte is only located once a block
+    // is known to differ.
+    for (; i + 64 <= n; i += 64) {
+        __m256i a0 = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(a + i));
+        __m256i b0 = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(b + i));
+        __m256i a1 = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(a + i + 32));
+        __m256i b1 = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(b + i + 32));
+        __m256i d = _mm256_or_si256(_mm256_xor_si256(a0, b0), _mm256_xor_si256(a1, b1));
+        if (!_mm256_testz_si256(d, d)) {
+            uint32_t eq0 = static_cast<uint32_t>(_mm256_movemask_epi8(_mm256_cmpeq_epi8(a0, b0)));
+            if (eq0 != 0xFFFFFFFFu)
+                return i + static_cast<size_t>(__builtin_ctz(~eq0));
+            uint32_t eq1 = static_cast<uint32_t>(_mm256_movemask_epi8(_mm256_cmpeq_epi8(a1, b1)));
+            return i + 32 + static_cast<size_t>(__builtin_ctz(~eq1));
+        }
+    }
+    return i + first_mismatch_scalar(a + i, b + i, n - i);
+}
+
+__attribute__((target("avx512bw,bmi")))
+static size_t first_mismatch_avx512(const char* a, const char* b, size_t n) {
+    size_t i = 0;
+    for (; i + 128 <= n; i += 128) {
+        uint64_t ne0 = _mm512_cmpneq_epi8_mask(_mm512_loadu_si512(a + i),
+                                               _mm512_loadu_si512(b + i));
+        uint64_t ne1 = _mm512_cmpneq_epi8_mask(_mm512_loadu_si512(a + i + 64),
+                                               _mm512_loadu_si512(b + i + 64));
+        if (ne0 | ne1) {
+            if (ne0)
+                return i + static_cast<size_t>(__builtin_ctzll(ne0));
+            return i + 64 + static_cast<size_t>(__builtin_ctzll(ne1));
+        }
+    }
+    return i + first_mismatch_scalar(a + i, b + i, n - i);
+}
+#endif
+
+// ---------------------------------------------------------------------------
+// Dispatch
+//
+// The best variant of every kernel is picked once, when the module is
+// loaded, and called through a plain function pointer afterwards. All
+// variants live in this file and carry their ISA in a target attribute, so
+// the compiler never emits AVX code for anything the scalar paths share
+// (inline std::vector members and the like).
+// ---------------------------------------------------------------------------
+
+struct Kernels {
+    const char* (*find_literal)(const char*, size_t, const char*, size_t, bool);
+    size_t (*count_byte)(const char*, size_t, char);
+    void (*find_all_bytes)(const char*, size_t, char, std::vector<size_t>&);
+    void (*find_all_bytes2)(const char*, size_t, char, char, std::vector<size_t>&);
+    LineWordCounts (*count_lines_words)(const char*, size_t);
+    size_t (*first_mismatch)(const char*, const char*, size_t);
+};
+
+static Kernels select_kernels() {
+    Kernels k;
+    k.find_literal = find_literal_scalar;
+    k.count_byte = count_byte_scalar;
+    k.find_all_bytes = [](const char* p, size_t n, char c, std::vector<size_t>& out) {
+        find_all_bytes_scalar(p, n, c, 0, out);
+    };
+    k.find_all_bytes2 = [](const char* p, size_t n, char a, char b, std::vector<size_t>& out) {
+        find_all_bytes2_scalar(p, n, a, b, 0, out);
+    };
+    k.count_lines_words = [](const char* p, size_t n) {
+        return count_lines_words_scalar(p, n, true, LineWordCounts{});
+    };
+    k.first_mismatch = first_mismatch_scalar;
+#ifdef SF_HAVE_X86
+    // Runs during static initialization, possibly before libgcc's own CPU
+    // probe.
+    __builtin_cpu_init();
+    if (__builtin_cpu_supports("avx2")) {
+        k.find_literal = find_literal_avx2;
+        k.count_byte = count_byte_avx2;
+        k.find_all_bytes = find_all_bytes_avx2;
+        k.find_all_bytes2 = find_all_bytes2_avx2;
+        k.count_lines_words = count_lines_words_avx2;
+        k.first_mismatch = first_mismatch_avx2;
+    }
+    // find_all_bytes stays on AVX2: it is bound by the appends, not the
+    // compares.
+    if (__builtin_cpu_supports("avx512bw")) {
+        k.find_literal = find_literal_avx512;
+        k.count_byte = count_byte_avx512;
+        k.count_lines_words = count_lines_words_avx512;
+        k.first_mismatch = first_mismatch_avx512;
+    }
+#endif
+    return k;
+}
+
+static const Kernels kernels = select_kernels();
+
+const char* find_literal(const char* hay, size_t n,
+                         const std::string& needle, bool ignore_case) {
+    size_t m = needle.size();
+    if (m == 0)
+        return hay;
+    if (m > n)
+        return nullptr;
+    return kernels.find_literal(hay, n, needle.data(), m, ignore_case);
+}
+
+size_t count_byte(const char* p, size_t n, char c) {
+    return kernels.count_byte(p, n, c);
+}
+
+void find_all_bytes(const char* p, size_t n, char c, std::vector<size_t>& out) {
+    kernels.find_all_bytes(p, n, c, out);
+}
+
+void find_all_bytes(const char* p, size_t n, char a, char b, std::vector<size_t>& out) {
+    kernels.find_all_bytes2(p, n, a, b, out);
+}
+
+LineWordCounts count_lines_words(const char* p, size_t n) {
+    return kernels.count_lines_words(p, n);
+}
+
+size_t first_mismatch(const char* a, const char* b, size_t n) {
+    return kernels.first_mismatch(a, b, n);
+}
+
+} // namespace sf
@@ -0,0 +1,45 @@
+#pragma once
+#include <cstddef>
+#include <string>
+#include <vector>
+
+namespace sf {
+
+// ---------------------------------------------------------------------------
+// Byte-scanning kernels shared by the text commands
+//
+// Each kernel has a portable scalar implementation and, on x86-64, AVX2 and
+// (where it pays off) AVX-512BW variants. The variant is chosen once per
+// process from the CPU's features.
+// ---------------------------------------------------------------------------
+
+// Returns a pointer to the first occurrence of `needle` in [hay, hay + n),
+// or nullptr. With ignore_case, ASCII letters compare case-insensitively
+// (matching std::regex::icase in the "C" locale).
+const char* find_literal(const char* hay, size_t n,
+                         const std::string& needle, bool ignore_case);
+
+// Number of bytes equal to `c` in [p, p + n).
+size_t count_byte(const char* p, size_t n, char c);
+
+// Appends the offset of every byte equal to `c` in [p, p + n) to `out`.
+void find_all_bytes(const char* p, size_t n, char c, std::vector<size_t>& out);
+
+// Appends the offset of every byte equal to `a` or `b` in [p, p + n) to
+// `out`, in order. Lets line/field splitters find newlines and delimiters
+// in one pass.
+void find_all_bytes(const char* p, size_t n, char a, char b, std::vector<size_t>& out);
+
+struct LineWordCounts {
+    size_t lines = 0;  // '\n' bytes
+    size_t words = 0;  // maximal runs of non-whitespace (C-locale isspace)
+};
+
+// Counts lines and words in [p, p + n) in a single pass.
+LineWordCounts count_lines_words(const char* p, size_t n);
+
+// Index of the first byte at which [a, a + n) and [b, b + n) differ, or n
+// if they are equal.
+size_t first_mismatch(const char* a, const char* b, size_t n);
+
+} // namespace sf
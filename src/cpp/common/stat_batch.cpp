@@ -0,0 +1,126 @@
+#include "common/stat_batch.h"
+#include "common/parallel.h"
+
+#include <algorithm>
+#include <cerrno>
+
+#include <fcntl.h>
+#include <sys/sysmacros.h>
+#include <unistd.h>
+
+#ifdef SHELLFAST_HAVE_LIBURING
+#include <liburing.h>
+#endif
+
+namespace sf {
+
+// Below this many names, a plain loop beats setting up a ring or threads.
+static constexpr size_t kMinBatch = 32;
+static constexpr size_t kMinThreadedBatch = 512;
+static constexpr unsigned kRingDepth = 4096;
+
+// Follow the link; fall back to the link itself if its target is missing.
+static bool stat_one(int dirfd, const std::string& name, struct stat& st) {
+    return fstatat(dirfd, name.c_str(), &st, 0) == 0 ||
+           fstatat(dirfd, name.c_str(), &st, AT_SYMLINK_NOFOLLOW) == 0;
+}
+
+static void stat_range(int dirfd, const std::vector<std::string>& names,
+                       std::vector<struct stat>& out, std::vector<char>& ok,
+                       size_t begin, size_t end) {
+    for (size_t i = begin; i < end; i++)
+        ok[i] = stat_one(dirfd, names[i], out[i]);
+}
+
+#if defined(SHELLFAST_HAVE_LIBURING) && defined(STATX_BASIC_STATS)
+
+static void statx_to_stat(const struct statx& sx, struct stat& st) {
+    st = {};
+    st.st_mode = sx.stx_mode;
+    st.st_nlink = sx.stx_nlink;
+    st.st_uid = sx.stx_uid;
+    st.st_gid = sx.stx_gid;
+    st.st_size = static_cast<off_t>(sx.stx_size);
+    st.st_blocks = static_cast<blkcnt_t>(sx.stx_blocks);
+    st.st_blksize = static_cast<blksize_t>(sx.stx_blksize);
+    st.st_ino = sx.stx_ino;
+    st.st_dev = makedev(sx.stx_dev_major, sx.stx_dev_minor);
+    st.st_rdev = makedev(sx.stx_rdev_major, sx.stx_rdev_minor);
+    st.st_atim = {sx.stx_atime.tv_sec, sx.stx_atime.tv_nsec};
+    st.st_mtim = {sx.stx_mtime.tv_sec, sx.stx_mtime.tv_nsec};
+    st.st_ctim = {sx.stx_ctime.tv_sec, sx.stx_ctime.tv_nsec};
+}
+
+// Returns false if no ring could be created (kernel < 5.1, io_uring disabled
+// by sysctl or seccomp); the caller then falls back to direct syscalls.
+// Requests the kernel rejects (IORING_OP_STATX needs 5.6) or that fail on a
+// dangling symlink are retried with stat_one().
+static bool stat_batch_uring(int dirfd, const std::vector<std::string>& names,
+                             std::vector<struct stat>& out, std::vector<char>& ok) {
+    size_t n = names.size();
+    struct io_uring ring;
+    unsigned depth = static_cast<unsigned>(std::min<size_t>(n, kRingDepth));
+    if (io_uring_queue_init(depth, &ring, 0) < 0)
+        return false;
+
+    std::vector<struct statx> sx(n);
+    std::vector<int> res(n, -EINVAL);
+    size_t submitted = 0, completed = 0;
+    while (completed < n) {
+        while (submitted < n) {
+            struct io_uring_sqe* sqe = io_uring_get_sqe(&ring);
+            if (!sqe) break;
+            io_uring_prep_statx(sqe, dirfd, names[submitted].c_str(), 0,
+                                STATX_BASIC_STATS, &sx[submitted]);
+            io_uring_sqe_set_data(sqe, reinterpret_cast<void*>(submitted));
+            submitted++;
+        }
+        int ret = io_uring_submit_and_wait(&ring, 1);
+        if (ret < 0 && ret != -EINTR && ret != -EAGAIN && ret != -EBUSY)
+            break;  // whatever has not completed is retried below
+
+        struct io_uring_cqe* cqe;
+        unsigned head, seen = 0;
+        io_uring_for_each_cqe(&ring, head, cqe) {
+            res[reinterpret_cast<size_t>(io_uring_cqe_get_data(cqe))] = cqe->res;
+            seen++;
+        }
+        io_uring_cq_advance(&ring, seen);
+        completed += seen;
+    }
+    io_uring_queue_exit(&ring);
+
+    for (size_t i = 0; i < n; i++) {
+        if (res[i] == 0) {
+            statx_to_stat(sx[i], out[i]);
+            ok[i] = true;
+        } else {
+            ok[i] = stat_one(dirfd, names[i], out[i]);
+        }
+    }
+    return true;
+}
+
+#endif
+
+void stat_many_at(int dirfd, const std::vector<std::string>& names,
+                  std::vector<struct stat>& out, std::vector<char>& ok) {
+    size_t n = names.size();
+    out.assign(n, {});
+    ok.assign(n, false);
+    if (n < kMinBatch) {
+        stat_range(dirfd, names, out, ok, 0, n);
+        return;
+    }
+
+#if defined(SHELLFAST_HAVE_LIBURING) && defined(STATX_BASIC_STATS)
+    if (stat_batch_uring(dirfd, names, out, ok))
+        return;
+#endif
+
+    parallel_ranges(n, kMinThreadedBatch, [&](size_t begin, size_t end) {
+        stat_range(dirfd, names, out, ok, begin, end);
+    });
+}
+
+} // namespace sf
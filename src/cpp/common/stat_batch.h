@@ -0,0 +1,23 @@
+#pragma once
+#include <string>
+#include <vector>
+
+#include <sys/stat.h>
+
+namespace sf {
+
+// ---------------------------------------------------------------------------
+// Batched stat
+//
+// Stats many names relative to one directory fd (or AT_FDCWD). With liburing
+// available, all requests are submitted to an io_uring as IORING_OP_STATX in
+// a single batch; otherwise large batches are spread over a few threads
+// issuing the stat calls directly.
+// ---------------------------------------------------------------------------
+
+// Fills out[i] for names[i], following symlinks; a dangling symlink reports
+// the link itself. ok[i] is false if the name could not be stat'ed at all.
+void stat_many_at(int dirfd, const std::vector<std::string>& names,
+                  std::vector<struct stat>& out, std::vector<char>& ok);
+
+} // namespace sf
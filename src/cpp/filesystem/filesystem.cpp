@@ -1,4 +1,9 @@
 #include "filesystem.h"
+#include "common/dir_reader.h"
+#include "common/parallel.h"
+#include "common/stat_batch.h"
+#include "common/unique_fd.h"
+
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
@@ -10,8 +15,20 @@
 #include <sstream>
 #include <chrono>
 #include <ctime>
+#include <cerrno>
 #include <cstring>
-
+#include <map>
+#include <mutex>
+#include <condition_variable>
+#include <thread>
+#include <tuple>
+#include <unordered_map>
+
+#include <dirent.h>
+#include <fcntl.h>
+#include <linux/fs.h>
+#include <sys/ioctl.h>
+#include <sys/sendfile.h>
 #include <sys/stat.h>
 #include <sys/types.h>
 #include <unistd.h>
@@ -55,47 +72,74 @@ static std::string permissions_string(fs::perms p) {
     return s;
 }
 
-static std::string format_time(fs::file_time_type ftime) {
-    auto sctp = std::chrono::time_point_cast<std::chrono::system_clock::duration>(
-        ftime - fs::file_time_type::clock::now() + std::chrono::system_clock::now());
-    std::time_t tt = std::chrono::system_clock::to_time_t(sctp);
+static std::string format_time(std::time_t tt) {
     char buf[64];
     std::strftime(buf, sizeof(buf), "%Y-%m-%d %H:%M:%S", std::localtime(&tt));
     return std::string(buf);
 }
 
-static std::string get_owner(const fs::path& p) {
-    struct stat st;
-    if (stat(p.c_str(), &st) == 0) {
-        struct passwd* pw = getpwuid(st.st_uid);
-        return pw ? pw->pw_name : std::to_string(st.st_uid);
+// getpwuid()/getgrgid() may re-read /etc/passwd (or query NSS) on every
+// call, so a listing resolves each distinct id once.
+class IdNameCache {
+public:
+    const std::string& owner(uid_t uid) {
+        auto it = users_.find(uid);
+        if (it != users_.end()) return it->second;
+        struct passwd* pw = getpwuid(uid);
+        return users_.emplace(uid, pw ? pw->pw_name : std::to_string(uid)).first->second;
     }
-    return "?";
-}
 
-static std::string get_group(const fs::path& p) {
-    struct stat st;
-    if (stat(p.c_str(), &st) == 0) {
-        struct group* gr = getgrgid(st.st_gid);
-        return gr ? gr->gr_name : std::to_string(st.st_gid);
+    const std::string& group(gid_t gid) {
+        auto it = groups_.find(gid);
+        if (it != groups_.end()) return it->second;
+        struct group* gr = getgrgid(gid);
+        return groups_.emplace(gid, gr ? gr->gr_name : std::to_string(gid)).first->second;
     }
-    return "?";
-}
 
-static std::string file_type_char(const fs::directory_entry& e) {
-    if (e.is_symlink()) return "l";
-    if (e.is_directory()) return "d";
-    if (e.is_block_file()) return "b";
-    if (e.is_character_file()) return "c";
-    if (e.is_fifo()) return "p";
-    if (e.is_socket()) return "s";
+private:
+    std::unordered_map<uid_t, std::string> users_;
+    std::unordered_map<gid_t, std::string> groups_;
+};
+
+static std::string file_type_char(unsigned char d_type, const struct stat& st) {
+    if (d_type == DT_LNK) return "l";
+    if (S_ISDIR(st.st_mode)) return "d";
+    if (S_ISBLK(st.st_mode)) return "b";
+    if (S_ISCHR(st.st_mode)) return "c";
+    if (S_ISFIFO(st.st_mode)) return "p";
+    if (S_ISSOCK(st.st_mode)) return "s";
     return "-";
 }
 
+// Joins a directory and an entry name the way fs::path::operator/ would.
+static std::string join_path(const std::string& dir, const std::string& name) {
+    if (!dir.empty() && dir.back() == '/')
+        return dir + name;
+    return dir + "/" + name;
+}
+
+// Resolves the type of a symlink's target. Directory walks only know the
+// link itself from d_type, but ls/find/du historically followed links when
+// classifying files and directories.
+static unsigned char target_dtype(int dirfd, const sf::DirEntry& e) {
+    if (e.type != DT_LNK) return e.type;
+    struct stat st;
+    if (fstatat(dirfd, e.name.c_str(), &st, 0) != 0) return DT_UNKNOWN;
+    return sf::mode_to_dtype(st.st_mode);
+}
+
 // ---------------------------------------------------------------------------
 // ls — List directory contents
 // ---------------------------------------------------------------------------
 
+struct LsEntry {
+    std::string name;
+    std::string path;
+    unsigned char type;    // d_type of the entry itself
+    bool has_stat = false; // st follows symlinks; lstat for dangling links
+    struct stat st {};
+};
+
 static py::list ls_impl(const std::string& path,
                          bool all,
                          bool long_format,
@@ -107,81 +151,123 @@ static py::list ls_impl(const std::string& path,
     fs::path dir_path(path);
     if (!fs::exists(dir_path))
         throw py::value_error("ls: cannot access '" + path + "': No such file or directory");
+    if (!fs::is_directory(dir_path))
+        throw py::value_error("ls: cannot open directory '" + path + "': Not a directory");
+
+    bool need_stat = long_format || sort_by == "size" || sort_by == "time";
+    std::vector<LsEntry> entries;
+
+    // Pre-order walk, matching fs::recursive_directory_iterator: each entry
+    // is listed before its children, and symlinked directories are not
+    // descended into. Unreadable subdirectories are skipped. A directory is
+    // fully read (and its entries stat'ed) before its fd is closed, so the
+    // walk holds one descriptor at a time regardless of depth.
+    auto walk = [&](const std::string& dir, auto& self) -> void {
+        std::vector<sf::DirEntry> dirents;
+        std::vector<std::pair<LsEntry, bool>> level;  // (entry, listed?)
+        {
+            sf::UniqueFd fd(sf::open_dir(dir));
+            if (!fd) return;
+            sf::read_dir(fd.get(), dirents);
+
+            std::vector<std::string> to_stat;
+            for (auto& d : dirents) {
+                bool descend = recursive && d.type == DT_DIR;
+                bool listed = all || d.name[0] != '.';
+                if (listed && directory_only)
+                    listed = target_dtype(fd.get(), d) == DT_DIR;
+                if (!listed && !descend) continue;
+
+                LsEntry e;
+                e.path = join_path(dir, d.name);
+                e.type = d.type;
+                if (listed && need_stat)
+                    to_stat.push_back(d.name);
+                e.name = std::move(d.name);
+                level.emplace_back(std::move(e), listed);
+            }
 
-    std::vector<fs::directory_entry> entries;
+            // One batch per directory instead of one stat() round-trip per entry.
+            if (!to_stat.empty()) {
+                std::vector<struct stat> st;
+                std::vector<char> ok;
+                sf::stat_many_at(fd.get(), to_stat, st, ok);
+                size_t k = 0;
+                for (auto& [e, listed] : level) {
+                    if (!listed) continue;
+                    e.st = st[k];
+                    e.has_stat = ok[k];
+                    k++;
+                }
+            }
+        }
 
-    auto collect = [&](auto& iterator) {
-        for (const auto& entry : iterator) {
-            std::string name = entry.path().filename().string();
-            if (!all && !name.empty() && name[0] == '.')
-                continue;
-            if (directory_only && !entry.is_directory())
-                continue;
-            entries.push_back(entry);
+        for (auto& [e, listed] : level) {
+            bool descend = recursive && e.type == DT_DIR;
+            std::string sub = descend ? e.path : std::string();
+            if (listed) entries.push_back(std::move(e));
+            if (descend) self(sub, self);
         }
     };
 
-    if (recursive) {
-        auto it = fs::recursive_directory_iterator(
-            dir_path, fs::directory_options::skip_permission_denied);
-        collect(it);
-    } else {
-        auto it = fs::directory_iterator(
-            dir_path, fs::directory_options::skip_permission_denied);
-        collect(it);
-    }
-
-    // Sort
-    if (sort_by == "name") {
-        std::sort(entries.begin(), entries.end(),
-                  [](const auto& a, const auto& b) {
-                      return a.path().filename() < b.path().filename();
-                  });
-    } else if (sort_by == "size") {
-        std::sort(entries.begin(), entries.end(),
-                  [](const auto& a, const auto& b) {
-                      uintmax_t sa = a.is_regular_file() ? a.file_size() : 0;
-                      uintmax_t sb = b.is_regular_file() ? b.file_size() : 0;
-                      return sa < sb;
-                  });
-    } else if (sort_by == "time") {
-        std::sort(entries.begin(), entries.end(),
-                  [](const auto& a, const auto& b) {
-                      return a.last_write_time() < b.last_write_time();
-                  });
-    }
-
-    if (reverse)
-        std::reverse(entries.begin(), entries.end());
+    auto size_of = [](const LsEntry& e) -> uintmax_t {
+        return e.has_stat && S_ISREG(e.st.st_mode) ? static_cast<uintmax_t>(e.st.st_size) : 0;
+    };
+
+    {
+        py::gil_scoped_release release;
+        walk(path, walk);
+
+        // Sort
+        if (sort_by == "name") {
+            std::sort(entries.begin(), entries.end(),
+                      [](const LsEntry& a, const LsEntry& b) { return a.name < b.name; });
+        } else if (sort_by == "size") {
+            std::sort(entries.begin(), entries.end(),
+                      [&](const LsEntry& a, const LsEntry& b) { return size_of(a) < size_of(b); });
+        } else if (sort_by == "time") {
+            std::sort(entries.begin(), entries.end(),
+                      [](const LsEntry& a, const LsEntry& b) {
+                          return std::tie(a.st.st_mtim.tv_sec, a.st.st_mtim.tv_nsec) <
+                                 std::tie(b.st.st_mtim.tv_sec, b.st.st_mtim.tv_nsec);
+                      });
+        }
+
+        if (reverse)
+            std::reverse(entries.begin(), entries.end());
+    }
 
     py::list result;
+    IdNameCache names;
 
     for (const auto& entry : entries) {
         if (long_format) {
+            const struct stat& st = entry.st;
+            bool ok = entry.has_stat;
             py::dict info;
-            info["name"]          = entry.path().filename().string();
-            info["path"]          = entry.path().string();
-            info["type"]          = file_type_char(entry);
-            info["is_directory"]  = entry.is_directory();
-            info["is_symlink"]    = entry.is_symlink();
-            info["permissions"]   = permissions_string(entry.status().permissions());
-            info["owner"]         = get_owner(entry.path());
-            info["group"]         = get_group(entry.path());
-            info["last_modified"] = format_time(entry.last_write_time());
-
-            uintmax_t sz = entry.is_regular_file() ? entry.file_size() : 0;
+            info["name"]          = entry.name;
+            info["path"]          = entry.path;
+            info["type"]          = file_type_char(entry.type, st);
+            info["is_directory"]  = ok && S_ISDIR(st.st_mode);
+            info["is_symlink"]    = entry.type == DT_LNK;
+            info["permissions"]   = permissions_string(static_cast<fs::perms>(st.st_mode & 07777));
+            info["owner"]         = ok ? names.owner(st.st_uid) : "?";
+            info["group"]         = ok ? names.group(st.st_gid) : "?";
+            info["last_modified"] = format_time(st.st_mtim.tv_sec);
+
+            uintmax_t sz = size_of(entry);
             info["size"]  = sz;
             info["size_human"] = human_readable_size(sz);
 
-            if (entry.is_symlink()) {
+            if (entry.type == DT_LNK) {
                 std::error_code ec;
-                auto target = fs::read_symlink(entry.path(), ec);
+                auto target = fs::read_symlink(entry.path, ec);
                 info["symlink_target"] = ec ? "" : target.string();
             }
 
             result.append(info);
         } else {
-            result.append(entry.path().filename().string());
+            result.append(entry.name);
         }
     }
 
@@ -280,14 +366,194 @@ static void touch_impl(const std::string& path, bool no_create) {
 // cp — Copy files and directories
 // ---------------------------------------------------------------------------
 
+// How cp() may share data blocks between source and copy (``cp --reflink``).
+enum class ReflinkMode { Auto, Always, Never };
+
+static ReflinkMode parse_reflink_mode(const std::string& mode) {
+    if (mode == "auto") return ReflinkMode::Auto;
+    if (mode == "always") return ReflinkMode::Always;
+    if (mode == "never") return ReflinkMode::Never;
+    throw py::value_error("cp: invalid argument '" + mode +
+                          "' for reflink (expected 'auto', 'always' or 'never')");
+}
+
+// Makes `out` share the data blocks of `in` (btrfs, XFS, bcachefs, ...), an
+// O(1) copy. Returns 0 or an errno value; EOPNOTSUPP where the kernel
+// headers lack FICLONE.
+static int clone_fd(int in, int out) {
+#ifdef FICLONE
+    return ::ioctl(out, FICLONE, in) == 0 ? 0 : errno;
+#else
+    (void)in;
+    (void)out;
+    return EOPNOTSUPP;
+#endif
+}
+
+// Copies everything from the current offset of `in` to `out`. Tries
+// copy_file_range() first (in-kernel, and a reflink on filesystems that
+// support it), then sendfile(), then a plain read/write loop. Without
+// allow_clone, copy_file_range() is skipped so that no blocks end up shared.
+// Returns 0 or an errno value.
+static int copy_fd_contents(int in, int out, bool try_kernel_copy, bool allow_clone) {
+    if (try_kernel_copy && allow_clone) {
+        bool progressed = false;
+        for (;;) {
+            ssize_t n = ::copy_file_range(in, nullptr, out, nullptr, 1 << 30, 0);
+            if (n > 0) { progressed = true; continue; }
+            if (n == 0) {
+                if (progressed) return 0;
+                break;  // some filesystems report 0 instead of an error
+            }
+            if (errno == EINTR) continue;
+            if (errno != EXDEV && errno != ENOSYS && errno != EINVAL &&
+                errno != EOPNOTSUPP && errno != EBADF && errno != EPERM &&
+                errno != EOVERFLOW)
+                return errno;
+            break;
+        }
+    }
+
+    if (try_kernel_copy) {
+        bool progressed = false;
+        for (;;) {
+            ssize_t n = ::sendfile(out, in, nullptr, 1 << 30);
+            if (n > 0) { progressed = true; continue; }
+            if (n == 0) {
+                if (progressed) return 0;
+                break;
+            }
+            if (errno == EINTR) continue;
+            if (errno != EINVAL && errno != ENOSYS)
+                return errno;
+            break;
+        }
+    }
+
+    std::vector<char> buf(1 << 20);
+    for (;;) {
+        ssize_t n = ::read(in, buf.data(), buf.size());
+        if (n == 0) return 0;
+        if (n < 0) {
+            if (errno == EINTR) continue;
+            return errno;
+        }
+        for (ssize_t off = 0; off < n;) {
+            ssize_t w = ::write(out, buf.data() + off, n - off);
+            if (w < 0) {
+                if (errno == EINTR) continue;
+                return errno;
+            }
+            off += w;
+        }
+    }
+}
+
+// Copies one regular file, keeping its permission bits. Mirrors
+// fs::copy_file(): an existing destination is an error unless `overwrite`.
+static void copy_regular_file(const fs::path& from, const fs::path& to,
+                              const struct stat& st, bool overwrite,
+                              ReflinkMode reflink) {
+    auto fail = [&](int err) {
+        throw fs::filesystem_error("cannot copy", from, to,
+                                   std::error_code(err, std::generic_category()));
+    };
+
+    struct stat dst_st;
+    bool existed = ::stat(to.c_str(), &dst_st) == 0;
+    if (existed) {
+        if (!overwrite || (dst_st.st_dev == st.st_dev && dst_st.st_ino == st.st_ino))
+            fail(EEXIST);
+        if (!S_ISREG(dst_st.st_mode))
+            fail(EINVAL);
+    }
+
+    sf::UniqueFd in(::open(from.c_str(), O_RDONLY | O_CLOEXEC));
+    if (!in)
+        fail(errno);
+    int flags = O_WRONLY | O_CREAT | O_CLOEXEC | (overwrite ? O_TRUNC : O_EXCL);
+    sf::UniqueFd out(::open(to.c_str(), flags, st.st_mode & 07777));
+    if (!out)
+        fail(errno);
+    if (::fchmod(out.get(), st.st_mode & 07777) != 0)
+        fail(errno);
+
+    if (reflink != ReflinkMode::Never) {
+        int err = clone_fd(in.get(), out.get());
+        if (err == 0)
+            return;
+        if (reflink == ReflinkMode::Always) {
+            // Like cp --reflink=always, leave no empty file behind.
+            if (!existed)
+                ::unlink(to.c_str());
+            throw fs::filesystem_error("cannot clone", from, to,
+                                       std::error_code(err, std::generic_category()));
+        }
+    }
+
+    // Pseudo-files (e.g. under /proc) report a size of 0 but have content;
+    // only a read/write loop copies those reliably.
+    if (int err = copy_fd_contents(in.get(), out.get(), st.st_size > 0,
+                                   reflink != ReflinkMode::Never))
+        fail(err);
+}
+
+// Recursive copy following the rules of fs::copy() with
+// copy_options::recursive, except that regular files go through
+// copy_regular_file() so they can be cloned as well.
+static void copy_tree(const fs::path& from, const fs::path& to, bool overwrite,
+                      bool copy_symlinks, ReflinkMode reflink) {
+    auto fail = [&](std::errc err) {
+        throw fs::filesystem_error("cannot copy", from, to, std::make_error_code(err));
+    };
+
+    fs::file_status status = copy_symlinks ? fs::symlink_status(from) : fs::status(from);
+    if (fs::is_symlink(status)) {
+        fs::copy_symlink(from, to);
+    } else if (fs::is_regular_file(status)) {
+        struct stat st;
+        if (::stat(from.c_str(), &st) != 0)
+            throw fs::filesystem_error("cannot copy", from, to,
+                                       std::error_code(errno, std::generic_category()));
+        copy_regular_file(from, to, st, overwrite, reflink);
+    } else if (fs::is_directory(status)) {
+        if (!fs::create_directory(to, from) && !fs::is_directory(to))
+            fail(std::errc::file_exists);
+        for (const auto& entry : fs::directory_iterator(from))
+            copy_tree(entry.path(), to / entry.path().filename(), overwrite, copy_symlinks, reflink);
+    } else if (!fs::exists(status)) {
+        fail(std::errc::no_such_file_or_directory);
+    } else {
+        fail(std::errc::not_supported);
+    }
+}
+
 static void cp_impl(const std::string& src, const std::string& dst,
-                     bool recursive, bool force, bool preserve) {
+                     bool recursive, bool force, bool preserve,
+                     const std::string& reflink) {
+    ReflinkMode reflink_mode = parse_reflink_mode(reflink);
     fs::path source(src);
     fs::path destination(dst);
 
     if (!fs::exists(source))
         throw py::value_error("cp: cannot stat '" + src + "': No such file or directory");
 
+    // Regular files are copied by hand so the data can stay in the kernel
+    // (or be cloned), including those inside a recursive copy; everything
+    // else goes through fs::copy.
+    struct stat st;
+    bool keep_link = preserve && fs::is_symlink(fs::symlink_status(source));
+    if (!keep_link && ::stat(source.c_str(), &st) == 0 && S_ISREG(st.st_mode)) {
+        if (fs::is_directory(destination))
+            destination /= source.filename();
+        copy_regular_file(source, destination, st, force, reflink_mode);
+        return;
+    }
+    if (recursive) {
+        copy_tree(source, destination, force, preserve, reflink_mode);
+        return;
+    }
+
     auto options = fs::copy_options::none;
     if (recursive)   options |= fs::copy_options::recursive;
     if (force)       options |= fs::copy_options::overwrite_existing;
@@ -335,6 +601,52 @@ static void ln_impl(const std::string& target, const std::string& link_name,
 // find — Search for files
 // ---------------------------------------------------------------------------
 
+// find's simple glob ("*x*" contains, "*x" suffix, "x*" prefix, anything else
+// exact), split up once per call rather than re-sliced for every entry.
+struct NameGlob {
+    enum class Kind { Any, Contains, Suffix, Prefix, Exact };
+    Kind kind = Kind::Any;
+    std::string text;
+
+    static NameGlob parse(const std::string& name) {
+        NameGlob g;
+        if (name.empty())
+            return g;
+        bool lead = name.front() == '*', trail = name.back() == '*';
+        if (lead && trail) {
+            g.kind = Kind::Contains;
+            g.text = name.size() > 2 ? name.substr(1, name.size() - 2) : "";
+        } else if (lead) {
+            g.kind = Kind::Suffix;
+            g.text = name.substr(1);
+        } else if (trail) {
+            g.kind = Kind::Prefix;
+            g.text = name.substr(0, name.size() - 1);
+        } else {
+            g.kind = Kind::Exact;
+            g.text = name;
+        }
+        return g;
+    }
+
+    bool matches(const std::string& fname) const {
+        switch (kind) {
+        case Kind::Any:
+            return true;
+        case Kind::Contains:
+            return fname.find(text) != std::string::npos;
+        case Kind::Suffix:
+            return fname.size() >= text.size() &&
+                   fname.compare(fname.size() - text.size(), text.size(), text) == 0;
+        case Kind::Prefix:
+            return fname.compare(0, text.size(), text) == 0;
+        case Kind::Exact:
+            return fname == text;
+        }
+        return false;
+    }
+};
+
 static py::list find_impl(const std::string& path,
                             const std::string& name,
                             const std::string& type,
@@ -344,78 +656,259 @@ static py::list find_impl(const std::string& path,
     fs::path root(path);
     if (!fs::exists(root))
         throw py::value_error("find: '" + path + "': No such file or directory");
-
-    py::list results;
-
-    auto matches_name = [&](const fs::directory_entry& entry) -> bool {
-        if (name.empty()) return true;
-        std::string fname = entry.path().filename().string();
-        // Simple glob: support '*' prefix/suffix
-        if (name.front() == '*' && name.back() == '*') {
-            std::string pattern = name.substr(1, name.size() - 2);
-            return fname.find(pattern) != std::string::npos;
-        } else if (name.front() == '*') {
-            std::string suffix = name.substr(1);
-            return fname.size() >= suffix.size() &&
-                   fname.compare(fname.size() - suffix.size(), suffix.size(), suffix) == 0;
-        } else if (name.back() == '*') {
-            std::string prefix = name.substr(0, name.size() - 1);
-            return fname.compare(0, prefix.size(), prefix) == 0;
-        }
-        return fname == name;
+    if (!fs::is_directory(root))
+        throw py::value_error("find: '" + path + "': Not a directory");
+
+    std::vector<std::string> results;
+    const NameGlob glob = NameGlob::parse(name);
+    auto matches_name = [&](const std::string& fname) { return glob.matches(fname); };
+
+    // Type and size checks follow symlinks, like fs::directory_entry's
+    // is_regular_file()/is_directory(). d_type answers them for everything
+    // but links, so only links (and size filters) need a stat().
+    bool size_filter = min_size >= 0 || max_size >= 0;
+    auto needs_stat = [&](const sf::DirEntry& e) -> bool {
+        if (e.type == DT_LNK) return type == "f" || type == "d" || size_filter;
+        return e.type == DT_REG && size_filter;
     };
 
-    auto matches_type = [&](const fs::directory_entry& entry) -> bool {
-        if (type.empty()) return true;
-        if (type == "f") return entry.is_regular_file();
-        if (type == "d") return entry.is_directory();
-        if (type == "l") return entry.is_symlink();
-        return true;
-    };
+    // `st` is the entry's stat when needs_stat(e) and it succeeded.
+    auto matches_type_and_size = [&](const sf::DirEntry& e, const struct stat* st) -> bool {
+        if (type == "l" && e.type != DT_LNK) return false;
+        unsigned char t = e.type;
+        if (needs_stat(e)) {
+            if (!st) return false;
+            t = sf::mode_to_dtype(st->st_mode);
+        }
+        if (type == "f" && t != DT_REG) return false;
+        if (type == "d" && t != DT_DIR) return false;
 
-    auto matches_size = [&](const fs::directory_entry& entry) -> bool {
-        if (!entry.is_regular_file()) return (min_size < 0 && max_size < 0);
-        auto sz = static_cast<long long>(entry.file_size());
+        if (t != DT_REG) return !size_filter;
+        if (!size_filter) return true;
+        auto sz = static_cast<long long>(st->st_size);
         if (min_size >= 0 && sz < min_size) return false;
         if (max_size >= 0 && sz > max_size) return false;
         return true;
     };
 
-    for (auto it = fs::recursive_directory_iterator(
-             root, fs::directory_options::skip_permission_denied);
-         it != fs::recursive_directory_iterator(); ++it) {
-        if (max_depth >= 0 && it.depth() > max_depth) {
-            it.disable_recursion_pending();
-            continue;
+    // Pre-order walk in directory order; entries at depth > max_depth are
+    // never read, rather than read and skipped.
+    auto walk = [&](const std::string& dir, int depth, auto& self) -> void {
+        std::vector<sf::DirEntry> dirents;
+        struct Pending { std::string path; bool match; bool descend; };
+        std::vector<Pending> level;
+        {
+            sf::UniqueFd fd(sf::open_dir(dir));
+            if (!fd) return;
+            sf::read_dir(fd.get(), dirents);
+
+            // Entries passing the name filter that still need a stat are
+            // resolved in one batch for the whole directory.
+            std::vector<std::string> to_stat;
+            for (auto& d : dirents) {
+                if (matches_name(d.name) && needs_stat(d))
+                    to_stat.push_back(d.name);
+            }
+            std::vector<struct stat> st;
+            std::vector<char> ok;
+            if (!to_stat.empty())
+                sf::stat_many_at(fd.get(), to_stat, st, ok);
+
+            size_t k = 0;
+            for (auto& d : dirents) {
+                bool descend = d.type == DT_DIR && (max_depth < 0 || depth < max_depth);
+                bool match = false;
+                if (matches_name(d.name)) {
+                    const struct stat* sp = nullptr;
+                    if (needs_stat(d)) {
+                        sp = ok[k] ? &st[k] : nullptr;
+                        k++;
+                    }
+                    match = matches_type_and_size(d, sp);
+                }
+                if (match || descend)
+                    level.push_back({join_path(dir, d.name), match, descend});
+            }
         }
-        if (matches_name(*it) && matches_type(*it) && matches_size(*it)) {
-            results.append(it->path().string());
+        for (auto& p : level) {
+            if (p.match) results.push_back(p.path);
+            if (p.descend) self(p.path, depth + 1, self);
         }
+    };
+    {
+        py::gil_scoped_release release;
+        walk(path, 0, walk);
     }
 
-    return results;
+    py::list out;
+    for (const auto& r : results)
+        out.append(r);
+    return out;
 }
 
 // ---------------------------------------------------------------------------
 // du — Disk usage
 // ---------------------------------------------------------------------------
 
+// Running totals for one du worker.
+struct DuTally {
+    uintmax_t total = 0;
+    std::map<std::string, uintmax_t> per_dir;
+};
+
+// Size of `name` in `dirfd` if it is (or links to) a regular file. statx with
+// AT_STATX_DONT_SYNC lets network filesystems answer from cached attributes.
+static bool regular_file_size(int dirfd, const char* name, uintmax_t& size) {
+#ifdef STATX_SIZE
+    struct statx stx;
+    if (statx(dirfd, name, AT_STATX_DONT_SYNC, STATX_TYPE | STATX_SIZE, &stx) == 0) {
+        if (!S_ISREG(stx.stx_mode)) return false;
+        size = stx.stx_size;
+        return true;
+    }
+    if (errno != ENOSYS) return false;
+#endif
+    struct stat st;
+    if (fstatat(dirfd, name, &st, 0) != 0 || !S_ISREG(st.st_mode)) return false;
+    size = static_cast<uintmax_t>(st.st_size);
+    return true;
+}
+
+// Adds the sizes of the regular files directly inside `dir` (following
+// symlinks to files) to `tally`, and appends its subdirectories (not
+// following symlinks) to `subdirs`. With per_dir, the sum is also recorded
+// against `dir` if it holds any regular file.
+static void du_scan_dir(const std::string& dir, bool per_dir, DuTally& tally,
+                        std::vector<std::string>& subdirs) {
+    std::vector<sf::DirEntry> dirents;
+    sf::UniqueFd fd(sf::open_dir(dir));
+    if (!fd) return;
+    sf::read_dir(fd.get(), dirents);
+
+    uintmax_t here = 0;
+    bool has_files = false;
+    for (auto& d : dirents) {
+        if (d.type == DT_DIR) {
+            subdirs.push_back(join_path(dir, d.name));
+            continue;
+        }
+        if (d.type != DT_REG && d.type != DT_LNK) continue;
+        uintmax_t sz;
+        if (!regular_file_size(fd.get(), d.name.c_str(), sz)) continue;
+        here += sz;
+        has_files = true;
+    }
+    tally.total += here;
+    if (per_dir && has_files)
+        tally.per_dir[dir] += here;
+}
+
+static void du_walk_serial(std::vector<std::string> stack, bool per_dir, DuTally& tally) {
+    while (!stack.empty()) {
+        std::string dir = std::move(stack.back());
+        stack.pop_back();
+        du_scan_dir(dir, per_dir, tally, stack);
+    }
+}
+
+// Shared stack of directories still to scan. `outstanding` counts queued plus
+// in-progress directories; the walk is finished when it drops to zero.
+class DuQueue {
+public:
+    void push(std::vector<std::string>& dirs) {
+        if (dirs.empty()) return;
+        std::lock_guard<std::mutex> lock(mu_);
+        outstanding_ += dirs.size();
+        for (auto& d : dirs) pending_.push_back(std::move(d));
+        dirs.clear();
+        cv_.notify_all();
+    }
+
+    bool pop(std::string& dir) {
+        std::unique_lock<std::mutex> lock(mu_);
+        cv_.wait(lock, [&] { return !pending_.empty() || outstanding_ == 0; });
+        if (pending_.empty()) return false;
+        // LIFO keeps the walk depth-first, so the queue stays small.
+        dir = std::move(pending_.back());
+        pending_.pop_back();
+        return true;
+    }
+
+    void done() {
+        std::lock_guard<std::mutex> lock(mu_);
+        if (--outstanding_ == 0) cv_.notify_all();
+    }
+
+private:
+    std::mutex mu_;
+    std::condition_variable cv_;
+    std::vector<std::string> pending_;
+    size_t outstanding_ = 0;
+};
+
+// Directory scans are latency-bound (one getdents64 + one statx per file), so
+// several can be in flight at once. Each worker keeps its own tally; they are
+// merged once the queue drains.
+static void du_walk_parallel(std::vector<std::string> roots, bool per_dir, DuTally& tally) {
+    unsigned workers = std::thread::hardware_concurrency();
+    if (workers == 0) workers = 4;
+    workers = std::min(workers, 16u);
+
+    DuQueue queue;
+    queue.push(roots);
+    std::vector<DuTally> tallies(workers);
+    std::vector<std::thread> threads;
+    for (unsigned i = 0; i < workers; i++) {
+        threads.emplace_back([&, i] {
+            std::string dir;
+            std::vector<std::string> subdirs;
+            while (queue.pop(dir)) {
+                du_scan_dir(dir, per_dir, tallies[i], subdirs);
+                queue.push(subdirs);
+                queue.done();
+            }
+        });
+    }
+    for (auto& t : threads) t.join();
+
+    for (auto& t : tallies) {
+        tally.total += t.total;
+        for (auto& [dir, sz] : t.per_dir) tally.per_dir[dir] += sz;
+    }
+}
+
+// Only trees that fan out early are worth the thread start-up cost.
+static constexpr size_t kDuParallelMinSubdirs = 4;
+
+static DuTally du_walk(const std::string& root, bool per_dir) {
+    DuTally tally;
+    std::vector<std::string> subdirs;
+    du_scan_dir(root, per_dir, tally, subdirs);
+    if (subdirs.size() > kDuParallelMinSubdirs)
+        du_walk_parallel(std::move(subdirs), per_dir, tally);
+    else
+        du_walk_serial(std::move(subdirs), per_dir, tally);
+    return tally;
+}
+
 static py::object du_impl(const std::string& path, bool human_readable,
                             bool summary_only) {
     fs::path root(path);
     if (!fs::exists(root))
         throw py::value_error("du: cannot access '" + path + "': No such file or directory");
 
+    // Per-directory keys use the same spelling as fs::path::parent_path().
+    std::string root_dir = path;
+    while (root_dir.size() > 1 && root_dir.back() == '/')
+        root_dir.pop_back();
+
     if (summary_only || fs::is_regular_file(root)) {
         uintmax_t total = 0;
         if (fs::is_regular_file(root)) {
             total = fs::file_size(root);
         } else {
-            for (auto& entry : fs::recursive_directory_iterator(
-                     root, fs::directory_options::skip_permission_denied)) {
-                if (entry.is_regular_file())
-                    total += entry.file_size();
-            }
+            py::gil_scoped_release release;
+            total = du_walk(root_dir, false).total;
         }
         py::dict res;
         res["path"] = root.string();
@@ -426,18 +919,13 @@ static py::object du_impl(const std::string& path, bool human_readable,
 
     // Per-directory breakdown
     py::list results;
-    std::map<std::string, uintmax_t> dir_sizes;
-
-    for (auto& entry : fs::recursive_directory_iterator(
-             root, fs::directory_options::skip_permission_denied)) {
-        if (entry.is_regular_file()) {
-            auto sz = entry.file_size();
-            auto dir = entry.path().parent_path().string();
-            dir_sizes[dir] += sz;
-        }
+    DuTally tally;
+    {
+        py::gil_scoped_release release;
+        tally = du_walk(root_dir, true);
     }
 
-    for (auto& [dir, sz] : dir_sizes) {
+    for (auto& [dir, sz] : tally.per_dir) {
         py::dict d;
         d["path"]  = dir;
         d["bytes"] = sz;
@@ -504,6 +992,10 @@ static void chown_impl(const std::string& path, const std::string& owner,
                                   "': " + std::strerror(errno));
     };
 
+    // getpwnam()/getgrnam() above share static buffers with the other
+    // passwd/group lookups, which the GIL serializes; only the walk itself
+    // runs without it.
+    py::gil_scoped_release release;
     apply(target);
     if (recursive && fs::is_directory(target)) {
         for (auto& entry : fs::recursive_directory_iterator(
@@ -513,6 +1005,113 @@ static void chown_impl(const std::string& path, const std::string& owner,
     }
 }
 
+// ---------------------------------------------------------------------------
+// touch_many / rm_many / stat_many — Batched variants for many paths
+// ---------------------------------------------------------------------------
+
+// Each path is an independent syscall or two, so big batches are spread over
+// a few threads.
+static constexpr size_t kMinParallelBatch = 1024;
+
+// Index of the first nonzero errno in `errs`, or errs.size().
+static size_t first_error(const std::vector<int>& errs) {
+    return static_cast<size_t>(
+        std::find_if(errs.begin(), errs.end(), [](int e) { return e != 0; }) - errs.begin());
+}
+
+static void touch_many_impl(const std::vector<std::string>& paths, bool no_create) {
+    // Like touch(): existing files only get a new modification time.
+    static const struct timespec times[2] = {{0, UTIME_OMIT}, {0, UTIME_NOW}};
+
+    std::vector<int> errs(paths.size(), 0);
+    sf::parallel_ranges(paths.size(), kMinParallelBatch, [&](size_t begin, size_t end) {
+        for (size_t i = begin; i < end; i++) {
+            const char* p = paths[i].c_str();
+            if (!no_create) {
+                int fd = ::open(p, O_WRONLY | O_CREAT | O_NOCTTY | O_NONBLOCK | O_CLOEXEC, 0666);
+                if (fd >= 0) {
+                    if (::futimens(fd, times) != 0)
+                        errs[i] = errno;
+                    ::close(fd);
+                    continue;
+                }
+            }
+            // Directories, read-only files and no_create end up here.
+            if (::utimensat(AT_FDCWD, p, times, 0) != 0 && !(no_create && errno == ENOENT))
+                errs[i] = errno;
+        }
+    });
+
+    size_t bad = first_error(errs);
+    if (bad < paths.size())
+        throw py::value_error("touch: cannot touch '" + paths[bad] + "': " +
+                              std::strerror(errs[bad]));
+}
+
+static void rm_many_impl(const std::vector<std::string>& paths, bool recursive, bool force) {
+    std::vector<int> errs(paths.size(), 0);
+    sf::parallel_ranges(paths.size(), kMinParallelBatch, [&](size_t begin, size_t end) {
+        for (size_t i = begin; i < end; i++) {
+            if (::unlink(paths[i].c_str()) == 0)
+                continue;
+            int err = errno;
+            if (err == EISDIR && recursive) {
+                std::error_code ec;
+                fs::remove_all(paths[i], ec);
+                err = ec.value();
+            } else if (err == ENOENT && force) {
+                err = 0;
+            }
+            errs[i] = err;
+        }
+    });
+
+    size_t bad = first_error(errs);
+    if (bad == paths.size())
+        return;
+    const std::string& path = paths[bad];
+    if (errs[bad] == ENOENT)
+        throw py::value_error("rm: cannot remove '" + path + "': No such file or directory");
+    if (errs[bad] == EISDIR)
+        throw py::value_error("rm: cannot remove '" + path + "': Is a directory (use recursive=True)");
+    throw fs::filesystem_error("cannot remove", fs::path(path),
+                               std::error_code(errs[bad], std::generic_category()));
+}
+
+static py::list stat_many_impl(const std::vector<std::string>& paths) {
+    std::vector<struct stat> st;
+    std::vector<char> ok;
+    {
+        py::gil_scoped_release release;
+        sf::stat_many_at(AT_FDCWD, paths, st, ok);
+    }
+
+    py::list result;
+    IdNameCache names;
+    for (size_t i = 0; i < paths.size(); i++) {
+        if (!ok[i]) {
+            result.append(py::none());
+            continue;
+        }
+        const struct stat& s = st[i];
+        py::dict info;
+        info["path"]          = paths[i];
+        info["type"]          = file_type_char(S_ISLNK(s.st_mode) ? DT_LNK : DT_UNKNOWN, s);
+        info["is_directory"]  = S_ISDIR(s.st_mode);
+        info["size"]          = static_cast<uintmax_t>(s.st_size);
+        info["permissions"]   = permissions_string(static_cast<fs::perms>(s.st_mode & 07777));
+        info["mode"]          = static_cast<unsigned>(s.st_mode & 07777);
+        info["owner"]         = names.owner(s.st_uid);
+        info["group"]         = names.group(s.st_gid);
+        info["inode"]         = static_cast<uintmax_t>(s.st_ino);
+        info["nlink"]         = static_cast<uintmax_t>(s.st_nlink);
+        info["mtime"]         = s.st_mtim.tv_sec + s.st_mtim.tv_nsec / 1e9;
+        info["last_modified"] = format_time(s.st_mtim.tv_sec);
+        result.append(info);
+    }
+    return result;
+}
+
 // ===========================================================================
 // pybind11 registration
 // ===========================================================================
@@ -587,7 +1186,8 @@ void init_filesystem(py::module_ &m) {
         Raises:
             ValueError: If path does not exist or is not a directory.
         )doc",
-        py::arg("path"));
+        py::arg("path"),
+        py::call_guard<py::gil_scoped_release>());
 
     // -- mkdir --------------------------------------------------------------
     m.def("mkdir", &mkdir_impl,
@@ -606,7 +1206,8 @@ void init_filesystem(py::module_ &m) {
             ValueError: If directory cannot be created.
         )doc",
         py::arg("path"),
-        py::arg("parents") = false);
+        py::arg("parents") = false,
+        py::call_guard<py::gil_scoped_release>());
 
     // -- rmdir --------------------------------------------------------------
     m.def("rmdir", &rmdir_impl,
@@ -622,7 +1223,8 @@ void init_filesystem(py::module_ &m) {
         Raises:
             ValueError: If path doesn't exist, is not a directory, or is not empty.
         )doc",
-        py::arg("path"));
+        py::arg("path"),
+        py::call_guard<py::gil_scoped_release>());
 
     // -- rm -----------------------------------------------------------------
     m.def("rm", &rm_impl,
@@ -645,7 +1247,8 @@ void init_filesystem(py::module_ &m) {
         )doc",
         py::arg("path"),
         py::arg("recursive") = false,
-        py::arg("force") = false);
+        py::arg("force") = false,
+        py::call_guard<py::gil_scoped_release>());
 
     // -- touch --------------------------------------------------------------
     m.def("touch", &touch_impl,
@@ -664,7 +1267,8 @@ void init_filesystem(py::module_ &m) {
             ValueError: If the file cannot be created.
         )doc",
         py::arg("path"),
-        py::arg("no_create") = false);
+        py::arg("no_create") = false,
+        py::call_guard<py::gil_scoped_release>());
 
     // -- cp -----------------------------------------------------------------
     m.def("cp", &cp_impl,
@@ -683,15 +1287,25 @@ void init_filesystem(py::module_ &m) {
                           Equivalent to ``cp -f``.
             preserve (bool): If True, preserve symlinks instead of following them.
                              Equivalent to ``cp -P``.
+            reflink (str): Whether regular files (also those inside a
+                           recursive copy) may be copied as a
+                           copy-on-write clone that shares the source's data
+                           blocks. "auto" clones where the filesystem supports
+                           it and copies otherwise, "always" fails instead of
+                           copying, "never" always copies the data.
+                           Equivalent to ``cp --reflink=WHEN``.
 
         Raises:
-            ValueError: If source does not exist.
+            ValueError: If source does not exist or reflink is not a valid mode.
+            RuntimeError: If reflink="always" and a file cannot be cloned.
         )doc",
         py::arg("src"),
         py::arg("dst"),
         py::arg("recursive") = false,
         py::arg("force") = false,
-        py::arg("preserve") = false);
+        py::arg("preserve") = false,
+        py::arg("reflink") = "auto",
+        py::call_guard<py::gil_scoped_release>());
 
     // -- mv -----------------------------------------------------------------
     m.def("mv", &mv_impl,
@@ -712,7 +1326,8 @@ void init_filesystem(py::module_ &m) {
         )doc",
         py::arg("src"),
         py::arg("dst"),
-        py::arg("force") = false);
+        py::arg("force") = false,
+        py::call_guard<py::gil_scoped_release>());
 
     // -- ln -----------------------------------------------------------------
     m.def("ln", &ln_impl,
@@ -733,7 +1348,8 @@ void init_filesystem(py::module_ &m) {
         )doc",
         py::arg("target"),
         py::arg("link_name"),
-        py::arg("symbolic") = false);
+        py::arg("symbolic") = false,
+        py::call_guard<py::gil_scoped_release>());
 
     // -- find ---------------------------------------------------------------
     m.def("find", &find_impl,
@@ -816,7 +1432,8 @@ void init_filesystem(py::module_ &m) {
         )doc",
         py::arg("path"),
         py::arg("mode"),
-        py::arg("recursive") = false);
+        py::arg("recursive") = false,
+        py::call_guard<py::gil_scoped_release>());
 
     // -- chown --------------------------------------------------------------
     m.def("chown", &chown_impl,
@@ -841,4 +1458,72 @@ void init_filesystem(py::module_ &m) {
         py::arg("owner") = "",
         py::arg("group") = "",
         py::arg("recursive") = false);
+
+    // -- touch_many ---------------------------------------------------------
+    m.def("touch_many", &touch_many_impl,
+        R"doc(
+        Create files or update their timestamps, for many paths at once.
+
+        Same as calling ``touch`` on each path, but the whole list is handled
+        in one call without the GIL (``touch a b c ...``). Every path is
+        attempted; the first failure is raised afterwards.
+
+        Args:
+            paths (list[str]): Files to touch.
+            no_create (bool): If True, do not create missing files.
+                              Equivalent to ``touch -c``.
+
+        Raises:
+            ValueError: If a path could not be created or updated.
+        )doc",
+        py::arg("paths"),
+        py::arg("no_create") = false,
+        py::call_guard<py::gil_scoped_release>());
+
+    // -- rm_many ------------------------------------------------------------
+    m.def("rm_many", &rm_many_impl,
+        R"doc(
+        Remove many files (or directories) at once.
+
+        Same as calling ``rm`` on each path, but the whole list is handled in
+        one call without the GIL (``rm a b c ...``). Every path is attempted;
+        the first failure is raised afterwards. A symlink is removed itself,
+        never its target.
+
+        Args:
+            paths (list[str]): Paths to remove.
+            recursive (bool): If True, remove directories and their contents.
+                              Equivalent to ``rm -r``.
+            force (bool): If True, ignore nonexistent paths.
+                          Equivalent to ``rm -f``.
+
+        Raises:
+            ValueError: If a path doesn't exist (without force) or is a
+                        directory (without recursive).
+        )doc",
+        py::arg("paths"),
+        py::arg("recursive") = false,
+        py::arg("force") = false,
+        py::call_guard<py::gil_scoped_release>());
+
+    // -- stat_many ----------------------------------------------------------
+    m.def("stat_many", &stat_many_impl,
+        R"doc(
+        Get file status for many paths at once.
+
+        Equivalent to ``stat`` over a list of paths. Symlinks are followed
+        (a dangling link reports the link itself), and the lookups are
+        batched like ``ls(long_format=True)`` does.
+
+        Args:
+            paths (list[str]): Paths to stat.
+
+        Returns:
+            list[dict | None]: One entry per path, in order, or None where the
+                               path does not exist. Each dict has keys: path,
+                               type, is_directory, size, permissions, mode,
+                               owner, group, inode, nlink, mtime (seconds since
+                               the epoch), last_modified.
+        )doc",
+        py::arg("paths"));
 }
@@ -35,7 +35,11 @@ static py::dict ping_impl(const std::string& host, int count, double timeout) {
     hints.ai_family = AF_INET;
     hints.ai_socktype = SOCK_DGRAM;
 
-    int err = getaddrinfo(host.c_str(), nullptr, &hints, &res);
+    int err;
+    {
+        py::gil_scoped_release release;
+        err = getaddrinfo(host.c_str(), nullptr, &hints, &res);
+    }
     if (err != 0)
         throw py::value_error("ping: unknown host " + host + ": " + gai_strerror(err));
 
@@ -74,44 +78,48 @@ static py::dict ping_impl(const std::string& host, int count, double timeout) {
     int sent = 0, received = 0;
     double total_rtt = 0, min_rtt = 1e9, max_rtt = 0;
 
-    for (int i = 0; i < count; i++) {
-        // ICMP echo request via DGRAM ICMP socket
-        struct icmphdr icmp_hdr = {};
-        icmp_hdr.type = ICMP_ECHO;
-        icmp_hdr.code = 0;
-        icmp_hdr.un.echo.id = getpid() & 0xFFFF;
-        icmp_hdr.un.echo.sequence = i + 1;
-
-        // Checksum
-        uint32_t sum = 0;
-        uint16_t* ptr = (uint16_t*)&icmp_hdr;
-        for (size_t j = 0; j < sizeof(icmp_hdr) / 2; j++)
-            sum += ptr[j];
-        sum = (sum >> 16) + (sum & 0xFFFF);
-        sum += (sum >> 16);
-        icmp_hdr.checksum = ~sum;
-
-        auto t_start = std::chrono::high_resolution_clock::now();
-
-        ssize_t n = sendto(sock, &icmp_hdr, sizeof(icmp_hdr), 0,
-                           (struct sockaddr*)&dest, sizeof(dest));
-        if (n <= 0) { sent++; continue; }
-        sent++;
-
-        char recv_buf[1024];
-        struct sockaddr_in from = {};
-        socklen_t fromlen = sizeof(from);
-        n = recvfrom(sock, recv_buf, sizeof(recv_buf), 0,
-                     (struct sockaddr*)&from, &fromlen);
-
-        auto t_end = std::chrono::high_resolution_clock::now();
-        double rtt = std::chrono::duration<double, std::milli>(t_end - t_start).count();
-
-        if (n > 0) {
-            received++;
-            total_rtt += rtt;
-            min_rtt = std::min(min_rtt, rtt);
-            max_rtt = std::max(max_rtt, rtt);
+    // Waiting for replies can take up to `timeout` per packet.
+    {
+        py::gil_scoped_release release;
+        for (int i = 0; i < count; i++) {
+            // ICMP echo request via DGRAM ICMP socket
+            struct icmphdr icmp_hdr = {};
+            icmp_hdr.type = ICMP_ECHO;
+            icmp_hdr.code = 0;
+            icmp_hdr.un.echo.id = getpid() & 0xFFFF;
+            icmp_hdr.un.echo.sequence = i + 1;
+
+            // Checksum
+            uint32_t sum = 0;
+            uint16_t* ptr = (uint16_t*)&icmp_hdr;
+            for (size_t j = 0; j < sizeof(icmp_hdr) / 2; j++)
+                sum += ptr[j];
+            sum = (sum >> 16) + (sum & 0xFFFF);
+            sum += (sum >> 16);
+            icmp_hdr.checksum = ~sum;
+
+            auto t_start = std::chrono::high_resolution_clock::now();
+
+            ssize_t n = sendto(sock, &icmp_hdr, sizeof(icmp_hdr), 0,
+                               (struct sockaddr*)&dest, sizeof(dest));
+            if (n <= 0) { sent++; continue; }
+            sent++;
+
+            char recv_buf[1024];
+            struct sockaddr_in from = {};
+            socklen_t fromlen = sizeof(from);
+            n = recvfrom(sock, recv_buf, sizeof(recv_buf), 0,
+                         (struct sockaddr*)&from, &fromlen);
+
+            auto t_end = std::chrono::high_resolution_clock::now();
+            double rtt = std::chrono::duration<double, std::milli>(t_end - t_start).count();
+
+            if (n > 0) {
+                received++;
+                total_rtt += rtt;
+                min_rtt = std::min(min_rtt, rtt);
+                max_rtt = std::max(max_rtt, rtt);
+            }
         }
     }
 
@@ -140,7 +148,11 @@ static py::dict nslookup_impl(const std::string& hostname, bool ipv6) {
     hints.ai_family = ipv6 ? AF_INET6 : AF_UNSPEC;
     hints.ai_socktype = SOCK_STREAM;
 
-    int err = getaddrinfo(hostname.c_str(), nullptr, &hints, &res);
+    int err;
+    {
+        py::gil_scoped_release release;
+        err = getaddrinfo(hostname.c_str(), nullptr, &hints, &res);
+    }
     if (err != 0)
         throw py::value_error("nslookup: can't resolve '" + hostname + "': " +
                               gai_strerror(err));
@@ -172,9 +184,14 @@ static py::dict nslookup_impl(const std::string& hostname, bool ipv6) {
     // Reverse lookup for each address
     if (res) {
         char host_buf[NI_MAXHOST];
-        if (getnameinfo(res->ai_addr, res->ai_addrlen,
-                        host_buf, sizeof(host_buf),
-                        nullptr, 0, NI_NAMEREQD) == 0) {
+        int rc;
+        {
+            py::gil_scoped_release release;
+            rc = getnameinfo(res->ai_addr, res->ai_addrlen,
+                             host_buf, sizeof(host_buf),
+                             nullptr, 0, NI_NAMEREQD);
+        }
+        if (rc == 0) {
             result["canonical_name"] = std::string(host_buf);
         }
     }
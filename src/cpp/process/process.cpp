@@ -1,4 +1,7 @@
 #include "process.h"
+#include "common/dir_reader.h"
+#include "common/unique_fd.h"
+
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
@@ -7,9 +10,12 @@
 #include <fstream>
 #include <sstream>
 #include <filesystem>
+#include <cerrno>
+#include <cstdlib>
 #include <cstring>
 #include <algorithm>
 
+#include <fcntl.h>
 #include <signal.h>
 #include <unistd.h>
 #include <dirent.h>
@@ -34,12 +40,100 @@ static std::string read_proc_file(const std::string& path) {
 // ps — List running processes
 // ---------------------------------------------------------------------------
 
-static py::list ps_impl(bool all, const std::string& sort_by) {
-    py::list result;
-    fs::path proc_dir("/proc");
+struct ProcInfo {
+    int pid;
+    int ppid;
+    std::string command;
+    std::string cmdline;
+    std::string state;
+    double cpu_percent;
+    double mem_kb;
+    long threads;
+    std::string uid;
+    long priority;
+    long nice;
+};
+
+// Reads up to `cap` bytes of `rel` (relative to `dirfd`) into `buf` and
+// returns the count, or 0 if the file cannot be read. /proc files are
+// generated in one go, so a single read() returns everything that fits.
+static size_t read_small_at(int dirfd, const char* rel, char* buf, size_t cap) {
+    sf::UniqueFd fd(::openat(dirfd, rel, O_RDONLY | O_CLOEXEC));
+    if (!fd) return 0;
+    ssize_t n;
+    do {
+        n = ::read(fd.get(), buf, cap);
+    } while (n < 0 && errno == EINTR);
+    return n > 0 ? static_cast<size_t>(n) : 0;
+}
+
+// Reads all of `rel` (relative to `dirfd`); empty if it cannot be read.
+static std::string read_all_at(int dirfd, const char* rel) {
+    std::string out;
+    sf::UniqueFd fd(::openat(dirfd, rel, O_RDONLY | O_CLOEXEC));
+    if (!fd) return out;
+    char buf[4096];
+    for (;;) {
+        ssize_t n = ::read(fd.get(), buf, sizeof(buf));
+        if (n < 0 && errno == EINTR) continue;
+        if (n <= 0) break;
+        out.append(buf, static_cast<size_t>(n));
+    }
+    return out;
+}
+
+// Minimal tokenizer for the space-separated numbers of /proc/[pid]/stat.
+class StatFields {
+public:
+    StatFields(const char* p, const char* end) : p_(p), end_(end) {}
+
+    std::string word() {
+        skip_space();
+        const char* b = p_;
+        while (p_ < end_ && *p_ != ' ' && *p_ != '\n') p_++;
+        return std::string(b, p_);
+    }
 
-    if (!fs::exists(proc_dir))
+    long long number() {
+        skip_space();
+        bool neg = p_ < end_ && *p_ == '-';
+        if (neg) p_++;
+        unsigned long long v = 0;
+        while (p_ < end_ && *p_ >= '0' && *p_ <= '9')
+            v = v * 10 + static_cast<unsigned>(*p_++ - '0');
+        return neg ? -static_cast<long long>(v) : static_cast<long long>(v);
+    }
+
+    void skip(int n) {
+        for (int i = 0; i < n; i++) {
+            skip_space();
+            while (p_ < end_ && *p_ != ' ' && *p_ != '\n') p_++;
+        }
+    }
+
+private:
+    void skip_space() {
+        while (p_ < end_ && *p_ == ' ') p_++;
+    }
+
+    const char* p_;
+    const char* end_;
+};
+
+// Reads every process visible in /proc. Touches no Python objects, so the
+// caller can run it without the GIL.
+//
+// /proc is listed with getdents64, and each process's files are opened
+// relative to its directory fd, so the kernel resolves "/proc/<pid>" once
+// per process instead of once per file.
+static std::vector<ProcInfo> read_processes(bool all) {
+    std::vector<ProcInfo> procs;
+
+    sf::UniqueFd proc_fd(sf::open_dir("/proc"));
+    if (!proc_fd)
         throw py::value_error("ps: /proc filesystem not available");
+    std::vector<sf::DirEntry> dirents;
+    sf::read_dir(proc_fd.get(), dirents);
 
     uid_t current_uid = getuid();
     long page_size = sysconf(_SC_PAGESIZE);
@@ -48,61 +142,56 @@ static py::list ps_impl(bool all, const std::string& sort_by) {
     // Read system uptime for CPU% calculation
     double sys_uptime = 0;
     {
-        std::ifstream ifs("/proc/uptime");
-        if (ifs.is_open()) ifs >> sys_uptime;
+        char buf[128];
+        size_t n = read_small_at(proc_fd.get(), "uptime", buf, sizeof(buf) - 1);
+        buf[n] = '\0';
+        if (n) sys_uptime = std::strtod(buf, nullptr);
     }
 
-    for (auto& entry : fs::directory_iterator(proc_dir)) {
-        if (!entry.is_directory()) continue;
-        std::string dirname = entry.path().filename().string();
+    for (const auto& entry : dirents) {
+        if (entry.type != DT_DIR) continue;
+        const std::string& dirname = entry.name;
 
         // Only numeric directories (PIDs)
         if (!std::all_of(dirname.begin(), dirname.end(), ::isdigit))
             continue;
 
         int pid = std::stoi(dirname);
-        std::string proc_path = "/proc/" + dirname;
-
-        // Read stat file
-        std::string stat_content = read_proc_file(proc_path + "/stat");
-        if (stat_content.empty()) continue;
+        sf::UniqueFd pid_fd(::openat(proc_fd.get(), dirname.c_str(),
+                                     O_RDONLY | O_DIRECTORY | O_CLOEXEC));
+        if (!pid_fd) continue;
 
         // Parse /proc/[pid]/stat
         // Format: pid (comm) state ppid pgrp ...
-        auto comm_start = stat_content.find('(');
-        auto comm_end = stat_content.rfind(')');
-        if (comm_start == std::string::npos || comm_end == std::string::npos)
+        // Everything up to rss fits well within the buffer.
+        char stat_buf[1024];
+        size_t stat_len = read_small_at(pid_fd.get(), "stat", stat_buf, sizeof(stat_buf));
+        if (stat_len == 0) continue;
+        const char* stat_end = stat_buf + stat_len;
+
+        auto* comm_start = static_cast<const char*>(std::memchr(stat_buf, '(', stat_len));
+        const char* comm_end = nullptr;
+        for (const char* c = stat_end; c > stat_buf; c--) {
+            if (c[-1] == ')') { comm_end = c - 1; break; }
+        }
+        if (!comm_start || !comm_end || comm_end < comm_start || comm_end + 2 > stat_end)
             continue;
 
-        std::string command = stat_content.substr(comm_start + 1, comm_end - comm_start - 1);
-        std::string after_comm = stat_content.substr(comm_end + 2);
-
-        std::istringstream iss(after_comm);
-        std::string state;
-        int ppid;
-        iss >> state >> ppid;
-
-        // Skip fields to get to utime and stime (fields 14 and 15 after comm)
-        std::string skip;
-        for (int i = 0; i < 9; i++) iss >> skip; // pgrp, session, tty, tpgid, flags, minflt, cminflt, majflt, cmajflt
-        unsigned long utime, stime;
-        iss >> utime >> stime;
-
-        // Skip to starttime (field 22)
-        unsigned long cutime, cstime;
-        iss >> cutime >> cstime;
-        long priority, nice;
-        iss >> priority >> nice;
-        long num_threads;
-        iss >> num_threads;
-        iss >> skip; // itrealvalue
-        unsigned long long starttime;
-        iss >> starttime;
-
-        // vsize and rss
-        unsigned long vsize;
-        long rss;
-        iss >> vsize >> rss;
+        std::string command(comm_start + 1, comm_end);
+        StatFields f(comm_end + 2, stat_end);
+        std::string state = f.word();
+        int ppid = static_cast<int>(f.number());
+        f.skip(9); // pgrp, session, tty, tpgid, flags, minflt, cminflt, majflt, cmajflt
+        unsigned long utime = static_cast<unsigned long>(f.number());
+        unsigned long stime = static_cast<unsigned long>(f.number());
+        f.skip(2); // cutime, cstime
+        long priority = static_cast<long>(f.number());
+        long nice = static_cast<long>(f.number());
+        long num_threads = static_cast<long>(f.number());
+        f.skip(1); // itrealvalue
+        unsigned long long starttime = static_cast<unsigned long long>(f.number());
+        f.skip(1); // vsize
+        long rss = static_cast<long>(f.number());
 
         // CPU percentage
         double total_time = static_cast<double>(utime + stime) / clk_tck;
@@ -112,62 +201,64 @@ static py::list ps_impl(bool all, const std::string& sort_by) {
         // Memory
         double mem_kb = rss * (page_size / 1024.0);
 
-        // UID check for non-all mode
-        std::string uid_str = "";
+        // UID from the "Uid:" line of status (real uid first)
+        uid_t proc_uid = 0;
         {
-            std::ifstream status_ifs(proc_path + "/status");
-            std::string line;
-            uid_t proc_uid = 0;
-            while (std::getline(status_ifs, line)) {
-                if (line.find("Uid:") == 0) {
-                    std::istringstream uid_iss(line.substr(4));
-                    uid_iss >> proc_uid;
-                    break;
-                }
-            }
-            if (!all && proc_uid != current_uid) continue;
-            uid_str = std::to_string(proc_uid);
+            char status_buf[4096];
+            size_t n = read_small_at(pid_fd.get(), "status", status_buf, sizeof(status_buf) - 1);
+            status_buf[n] = '\0';
+            const char* uid_line = std::strstr(status_buf, "\nUid:");
+            if (uid_line)
+                proc_uid = static_cast<uid_t>(std::strtoul(uid_line + 5, nullptr, 10));
         }
+        if (!all && proc_uid != current_uid) continue;
 
         // Read cmdline for full command
-        std::string cmdline = read_proc_file(proc_path + "/cmdline");
+        std::string cmdline = read_all_at(pid_fd.get(), "cmdline");
         std::replace(cmdline.begin(), cmdline.end(), '\0', ' ');
         if (cmdline.empty()) cmdline = "[" + command + "]";
 
-        py::dict proc;
-        proc["pid"]         = pid;
-        proc["ppid"]        = ppid;
-        proc["command"]     = command;
-        proc["cmdline"]     = cmdline;
-        proc["state"]       = state;
-        proc["cpu_percent"] = cpu_percent;
-        proc["mem_kb"]      = mem_kb;
-        proc["threads"]     = num_threads;
-        proc["uid"]         = uid_str;
-        proc["priority"]    = priority;
-        proc["nice"]        = nice;
-
-        result.append(proc);
+        procs.push_back({pid, ppid, command, cmdline, state, cpu_percent, mem_kb,
+                         num_threads, std::to_string(proc_uid), priority, nice});
     }
 
-    // Sort
-    if (!sort_by.empty()) {
-        auto items = result.cast<std::vector<py::dict>>();
-        std::sort(items.begin(), items.end(),
-                  [&](const py::dict& a, const py::dict& b) {
-                      if (sort_by == "cpu")
-                          return a["cpu_percent"].cast<double>() > b["cpu_percent"].cast<double>();
-                      if (sort_by == "mem")
-                          return a["mem_kb"].cast<double>() > b["mem_kb"].cast<double>();
-                      if (sort_by == "pid")
-                          return a["pid"].cast<int>() < b["pid"].cast<int>();
-                      return a["pid"].cast<int>() < b["pid"].cast<int>();
-                  });
-        result = py::list();
-        for (auto& item : items)
-            result.append(item);
+    return procs;
+}
+
+static py::list ps_impl(bool all, const std::string& sort_by) {
+    std::vector<ProcInfo> procs;
+    {
+        py::gil_scoped_release release;
+        procs = read_processes(all);
+
+        if (!sort_by.empty()) {
+            std::sort(procs.begin(), procs.end(),
+                      [&](const ProcInfo& a, const ProcInfo& b) {
+                          if (sort_by == "cpu")
+                              return a.cpu_percent > b.cpu_percent;
+                          if (sort_by == "mem")
+                              return a.mem_kb > b.mem_kb;
+                          return a.pid < b.pid;
+                      });
+        }
     }
 
+    py::list result;
+    for (const auto& p : procs) {
+        py::dict proc;
+        proc["pid"]         = p.pid;
+        proc["ppid"]        = p.ppid;
+        proc["command"]     = p.command;
+        proc["cmdline"]     = p.cmdline;
+        proc["state"]       = p.state;
+        proc["cpu_percent"] = p.cpu_percent;
+        proc["mem_kb"]      = p.mem_kb;
+        proc["threads"]     = p.threads;
+        proc["uid"]         = p.uid;
+        proc["priority"]    = p.priority;
+        proc["nice"]        = p.nice;
+        result.append(proc);
+    }
     return result;
 }
 
@@ -190,24 +281,27 @@ static py::dict killall_impl(const std::string& name, int sig) {
     int killed = 0;
     int failed = 0;
 
-    fs::path proc_dir("/proc");
-    for (auto& entry : fs::directory_iterator(proc_dir)) {
-        if (!entry.is_directory()) continue;
-        std::string dirname = entry.path().filename().string();
-        if (!std::all_of(dirname.begin(), dirname.end(), ::isdigit))
-            continue;
-
-        std::string comm = read_proc_file("/proc/" + dirname + "/comm");
-        // Remove trailing newline
-        while (!comm.empty() && (comm.back() == '\n' || comm.back() == '\r'))
-            comm.pop_back();
-
-        if (comm == name) {
-            int pid = std::stoi(dirname);
-            if (::kill(pid, sig) == 0)
-                killed++;
-            else
-                failed++;
+    {
+        py::gil_scoped_release release;
+        fs::path proc_dir("/proc");
+        for (auto& entry : fs::directory_iterator(proc_dir)) {
+            if (!entry.is_directory()) continue;
+            std::string dirname = entry.path().filename().string();
+            if (!std::all_of(dirname.begin(), dirname.end(), ::isdigit))
+                continue;
+
+            std::string comm = read_proc_file("/proc/" + dirname + "/comm");
+            // Remove trailing newline
+            while (!comm.empty() && (comm.back() == '\n' || comm.back() == '\r'))
+                comm.pop_back();
+
+            if (comm == name) {
+                int pid = std::stoi(dirname);
+                if (::kill(pid, sig) == 0)
+                    killed++;
+                else
+                    failed++;
+            }
         }
     }
 
@@ -272,7 +366,8 @@ void init_process(py::module_ &m) {
                         permission denied).
         )doc",
         py::arg("pid"),
-        py::arg("signal") = 15);
+        py::arg("signal") = 15,
+        py::call_guard<py::gil_scoped_release>());
 
     // -- killall ------------------------------------------------------------
     m.def("killall", &killall_impl,
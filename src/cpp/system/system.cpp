@@ -623,7 +623,8 @@ void init_system(py::module_ &m) {
         Args:
             seconds (float): Number of seconds to sleep.
         )doc",
-        py::arg("seconds"));
+        py::arg("seconds"),
+        py::call_guard<py::gil_scoped_release>());
 
     // -- id -----------------------------------------------------------------
     m.def("id", &id_impl,
@@ -1,4 +1,17 @@
 #include "text.h"
+#include "common/digits.h"
+#include "common/lru_cache.h"
+#include "common/mapped_file.h"
+#include "common/simd.h"
+#include "common/unique_fd.h"
+
+#ifdef SHELLFAST_HAVE_HYPERSCAN
+#include <hs/hs.h>
+#endif
+#ifdef SHELLFAST_HAVE_RE2
+#include <re2/re2.h>
+#endif
+
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
@@ -6,13 +19,26 @@
 #include <fstream>
 #include <sstream>
 #include <string>
+#include <unordered_map>
+#include <string_view>
 #include <vector>
 #include <algorithm>
 #include <regex>
 #include <map>
 #include <set>
 #include <numeric>
+#include <cctype>
+#include <cstdlib>
 #include <cstring>
+#include <cerrno>
+#include <charconv>
+#include <cstdint>
+#include <limits>
+#include <memory>
+
+#include <fcntl.h>
+#include <sys/stat.h>
+#include <unistd.h>
 
 namespace py = pybind11;
 namespace fs = std::filesystem;
@@ -30,14 +56,27 @@ static std::string read_file(const std::string& path) {
     return oss.str();
 }
 
-static std::vector<std::string> read_lines(const std::string& path) {
-    std::ifstream ifs(path);
-    if (!ifs.is_open())
+// Splits [data, data + size) into lines the way std::getline() does: on
+// '\n', with no empty line after a trailing newline.
+static void split_lines(const char* data, size_t size,
+                        std::vector<std::string_view>& lines) {
+    const char* end = data + size;
+    const char* pos = data;
+    while (pos < end) {
+        auto* nl = static_cast<const char*>(std::memchr(pos, '\n', end - pos));
+        const char* e = nl ? nl : end;
+        lines.emplace_back(pos, static_cast<size_t>(e - pos));
+        pos = nl ? nl + 1 : end;
+    }
+}
+
+// Maps a whole file and splits it into lines. The views point into `mf` and
+// stay valid for as long as it does.
+static std::vector<std::string_view> read_lines(sf::MappedFile& mf, const std::string& path) {
+    if (!mf.open(path, /*populate=*/true))
         throw py::value_error("Cannot open file: " + path);
-    std::vector<std::string> lines;
-    std::string line;
-    while (std::getline(ifs, line))
-        lines.push_back(line);
+    std::vector<std::string_view> lines;
+    split_lines(mf.data(), mf.size(), lines);
     return lines;
 }
 
@@ -45,27 +84,77 @@ static std::vector<std::string> read_lines(const std::string& path) {
 // cat — Concatenate and display file contents
 // ---------------------------------------------------------------------------
 
-static std::string cat_impl(const std::string& path,
-                              bool number_lines,
-                              bool squeeze_blank) {
-    auto lines = read_lines(path);
-    std::ostringstream oss;
-    int line_num = 1;
-    bool prev_blank = false;
-
-    for (const auto& line : lines) {
-        bool is_blank = line.empty() || line.find_first_not_of(" \t\r\n") == std::string::npos;
+// Decodes UTF-8 bytes straight into a Python str, with no intermediate
+// std::string copy. Invalid UTF-8 raises UnicodeDecodeError, like
+// pybind11's std::string conversion.
+static py::str decode_utf8(const char* data, size_t size) {
+    PyObject* obj = PyUnicode_DecodeUTF8(data, static_cast<Py_ssize_t>(size), nullptr);
+    if (!obj)
+        throw py::error_already_set();
+    return py::reinterpret_steal<py::str>(obj);
+}
 
-        if (squeeze_blank && is_blank && prev_blank)
-            continue;
+static py::str cat_impl(const std::string& path,
+                        bool number_lines,
+                        bool squeeze_blank) {
+    sf::MappedFile mf;
+    std::string out;
+    bool plain;
+    {
+        py::gil_scoped_release release;
+        if (!mf.open(path, /*populate=*/true))
+            throw py::value_error("Cannot open file: " + path);
+
+        // Every line is printed with a trailing newline, so a file that
+        // already ends in one can be decoded from the mapping as is.
+        const char* data = mf.data();
+        size_t size = mf.size();
+        bool ends_with_newline = size == 0 || data[size - 1] == '\n';
+        plain = !number_lines && !squeeze_blank && ends_with_newline;
+
+        if (!plain) {
+            size_t lines = sf::count_byte(data, size, '\n') + (ends_with_newline ? 0 : 1);
+            size_t num_width = number_lines ? std::to_string(lines).size() + 6 : 0;
+            out.reserve(size + 1 + lines * num_width);
+
+            const char* end = data + size;
+            const char* pos = data;
+            size_t line_num = 1;
+            bool prev_blank = false;
+            char num_buf[24];
+            while (pos < end) {
+                auto* nl = static_cast<const char*>(std::memchr(pos, '\n', end - pos));
+                const char* b = pos;
+                const char* e = nl ? nl : end;
+                pos = nl ? nl + 1 : end;
+
+                bool is_blank = true;
+                for (const char* c = b; c < e; c++) {
+                    if (*c != ' ' && *c != '\t' && *c != '\r') {
+                        is_blank = false;
+                        break;
+                    }
+                }
 
-        if (number_lines)
-            oss << "     " << line_num++ << "\t";
+                if (squeeze_blank && is_blank && prev_blank)
+                    continue;
 
-        oss << line << "\n";
-        prev_blank = is_blank;
+                if (number_lines) {
+                    out.append("     ");
+                    auto r = std::to_chars(num_buf, num_buf + sizeof(num_buf), line_num++);
+                    out.append(num_buf, r.ptr);
+                    out.push_back('\t');
+                }
+                out.append(b, e);
+                out.push_back('\n');
+                prev_blank = is_blank;
+            }
+        }
     }
-    return oss.str();
+
+    if (plain)
+        return decode_utf8(mf.data(), mf.size());
+    return decode_utf8(out.data(), out.size());
 }
 
 // ---------------------------------------------------------------------------
@@ -93,44 +182,413 @@ static std::string head_impl(const std::string& path, int n, int bytes) {
         return buf;
     }
 
-    auto lines = read_lines(path);
-    std::ostringstream oss;
-    int count = std::min(n, static_cast<int>(lines.size()));
-    for (int i = 0; i < count; i++)
-        oss << lines[i] << "\n";
-    return oss.str();
+    sf::MappedFile mf;
+    if (!mf.open(path))
+        throw py::value_error("Cannot open file: " + path);
+
+    // Only the first n lines are touched; the rest of the file is never
+    // faulted in.
+    const char* end = mf.end();
+    const char* pos = mf.begin();
+    for (int i = 0; i < n && pos < end; i++) {
+        auto* nl = static_cast<const char*>(std::memchr(pos, '\n', end - pos));
+        pos = nl ? nl + 1 : end;
+    }
+    std::string out(mf.begin(), pos);
+    if (!out.empty() && out.back() != '\n')
+        out.push_back('\n');
+    return out;
 }
 
 // ---------------------------------------------------------------------------
 // tail — Last N lines of a file
 // ---------------------------------------------------------------------------
 
+// Reads exactly `len` bytes at `offset`, retrying short reads.
+static bool pread_full(int fd, char* buf, size_t len, off_t offset) {
+    while (len > 0) {
+        ssize_t r = pread(fd, buf, len, offset);
+        if (r < 0 && errno == EINTR) continue;
+        if (r <= 0) return false;
+        buf += r;
+        len -= static_cast<size_t>(r);
+        offset += r;
+    }
+    return true;
+}
+
+// Offset in a buffer that ends at end-of-file where its last `n` lines begin,
+// or npos if the buffer holds fewer than n line breaks. A trailing '\n'
+// terminates the last line rather than starting a new one.
+static size_t last_lines_offset(const char* data, size_t len, int n) {
+    size_t end = len;
+    if (end > 0 && data[end - 1] == '\n') end--;
+    while (end > 0) {
+        auto* nl = static_cast<const char*>(memrchr(data, '\n', end));
+        if (!nl) break;
+        end = static_cast<size_t>(nl - data);
+        if (--n == 0) return end + 1;
+    }
+    return std::string::npos;
+}
+
 static std::string tail_impl(const std::string& path, int n, int bytes) {
-    if (bytes > 0) {
-        std::ifstream ifs(path, std::ios::binary | std::ios::ate);
-        if (!ifs.is_open())
+    sf::UniqueFd fd(::open(path.c_str(), O_RDONLY | O_CLOEXEC));
+    struct stat st;
+    if (!fd || fstat(fd.get(), &st) != 0 || S_ISDIR(st.st_mode))
+        throw py::value_error("tail: cannot open '" + path + "'");
+
+    // Pipes and /proc files have no usable size; read them whole.
+    if (!S_ISREG(st.st_mode) || st.st_size == 0) {
+        sf::MappedFile mf;
+        if (!mf.open(path))
             throw py::value_error("tail: cannot open '" + path + "'");
-        auto size = ifs.tellg();
-        int read_bytes = std::min(static_cast<int>(size), bytes);
-        ifs.seekg(-read_bytes, std::ios::end);
-        std::string buf(read_bytes, '\0');
-        ifs.read(&buf[0], read_bytes);
+        if (bytes > 0) {
+            size_t take = std::min(mf.size(), static_cast<size_t>(bytes));
+            return std::string(mf.end() - take, take);
+        }
+        if (n <= 0 || mf.size() == 0) return "";
+        size_t off = last_lines_offset(mf.data(), mf.size(), n);
+        if (off == std::string::npos) off = 0;
+        std::string out(mf.data() + off, mf.size() - off);
+        if (out.back() != '\n') out.push_back('\n');
+        return out;
+    }
+
+    off_t size = st.st_size;
+    if (bytes > 0) {
+        off_t take = std::min<off_t>(size, bytes);
+        std::string buf(static_cast<size_t>(take), '\0');
+        if (!pread_full(fd.get(), &buf[0], buf.size(), size - take))
+            throw py::value_error("tail: error reading '" + path + "'");
         return buf;
     }
+    if (n <= 0) return "";
+
+    // Read a window off the end of the file and widen it (doubling) until it
+    // holds n line breaks or reaches the start, so only the tail is read.
+    off_t window = 65536;
+    std::string buf;
+    size_t off;
+    for (;;) {
+        window = std::min(window, size);
+        buf.resize(static_cast<size_t>(window));
+        if (!pread_full(fd.get(), &buf[0], buf.size(), size - window))
+            throw py::value_error("tail: error reading '" + path + "'");
+        off = last_lines_offset(buf.data(), buf.size(), n);
+        if (off != std::string::npos) break;
+        if (window == size) { off = 0; break; }
+        window *= 2;
+    }
 
-    auto lines = read_lines(path);
-    int total = static_cast<int>(lines.size());
-    int start = std::max(0, total - n);
-    std::ostringstream oss;
-    for (int i = start; i < total; i++)
-        oss << lines[i] << "\n";
-    return oss.str();
+    buf.erase(0, off);
+    if (buf.back() != '\n') buf.push_back('\n');
+    return buf;
 }
 
 // ---------------------------------------------------------------------------
 // grep — Search for patterns in files
 // ---------------------------------------------------------------------------
 
+// True if `pattern` contains no ECMAScript regex metacharacters, i.e. it can
+// only ever match itself.
+static bool is_literal_pattern(const std::string& pattern) {
+    return pattern.find_first_of("\\^$.|?*+()[]{}") == std::string::npos;
+}
+
+// Longest run of bytes that every match of `pattern` has to contain, or ""
+// when none can be proven. Only concatenation at the top level is analysed:
+// alternation and inline flags give up entirely, while groups, classes,
+// anchors and escapes other than escaped punctuation just end the current
+// run. That keeps the answer safe for both ECMAScript and RE2 syntax.
+static std::string required_literal(const std::string& pattern, bool ignore_case) {
+    if (pattern.find("\\Q") != std::string::npos)
+        return "";
+
+    const size_t n = pattern.size();
+    const size_t npos = std::string::npos;
+
+    // Index just past the bracket expression starting at i, or npos.
+    auto skip_class = [&](size_t i) -> size_t {
+        i++;
+        if (i < n && pattern[i] == '^') i++;
+        if (i < n && pattern[i] == ']') return npos;  // "[]" differs between dialects
+        while (i < n && pattern[i] != ']') {
+            if (pattern[i] == '[' && i + 1 < n && std::strchr(":=.", pattern[i + 1])) {
+                // [:alpha:], [=a=] and [.a.] contain a ']' of their own.
+                const char close[] = {pattern[i + 1], ']', '\0'};
+                size_t end = pattern.find(close, i + 2);
+                if (end == npos) return npos;
+                i = end + 2;
+            } else {
+                i += pattern[i] == '\\' ? 2 : 1;
+            }
+        }
+        return i < n ? i + 1 : npos;
+    };
+
+    // Index just past the group starting at i, or npos.
+    auto skip_group = [&](size_t i) -> size_t {
+        int depth = 0;
+        while (i < n) {
+            char c = pattern[i];
+            if (c == '\\') {
+                i += 2;
+            } else if (c == '[') {
+                i = skip_class(i);
+                if (i == npos) return npos;
+            } else {
+                if (c == '(') depth++;
+                if (c == ')' && --depth == 0) return i + 1;
+                i++;
+            }
+        }
+        return npos;
+    };
+
+    std::string best, run;
+    auto flush = [&] {
+        if (run.size() > best.size()) best = run;
+        run.clear();
+    };
+
+    size_t i = 0;
+    while (i < n) {
+        char c = pattern[i];
+        unsigned char lit;
+        size_t next;
+
+        if (c == '|') {
+            return "";
+        } else if (c == '(') {
+            if (i + 2 < n && pattern[i + 1] == '?' &&
+                pattern[i + 2] != ':' && pattern[i + 2] != '=' &&
+                pattern[i + 2] != '!' && pattern[i + 2] != '<')
+                return "";  // (?i) and friends change how the rest matches
+            i = skip_group(i);
+            if (i == npos) return "";
+            flush();
+            continue;
+        } else if (c == '[') {
+            i = skip_class(i);
+            if (i == npos) return "";
+            flush();
+            continue;
+        } else if (c == '{') {
+            flush();
+            i = pattern.find('}', i);
+            i = i == npos ? n : i + 1;
+            continue;
+        } else if (c == '\\') {
+            if (i + 1 >= n) return "";
+            lit = static_cast<unsigned char>(pattern[i + 1]);
+            if (std::isalnum(lit)) {
+                // \d, \b, \x41, \1, ...: not a plain byte.
+                if (lit == 'k') return "";  // \k<name>
+                flush();
+                i += 2;
+                if (std::strchr("xucpP0123456789", lit))
+                    while (i < n && std::isalnum(static_cast<unsigned char>(pattern[i])))
+                        i++;
+                continue;
+            }
+            next = i + 2;
+        } else if (std::strchr(".^$?*+)", c)) {
+            flush();
+            i++;
+            continue;
+        } else {
+            lit = static_cast<unsigned char>(c);
+            next = i + 1;
+        }
+
+        // A byte only counts if it cannot be repeated zero times, and an
+        // open-ended repeat ends the run after it.
+        char q = next < n ? pattern[next] : '\0';
+        bool usable = lit != '\n' && (!ignore_case || lit < 0x80);
+        if (q == '?' || q == '*' || q == '{' || !usable) {
+            flush();
+        } else {
+            run.push_back(static_cast<char>(lit));
+            if (q == '+') flush();
+        }
+        i = next;
+    }
+    flush();
+    return best;
+}
+
+// Calls emit(line_number, begin, end) for every selected line of the buffer
+// in order; emit returns false to stop the scan early.
+//
+// The whole buffer is searched for `needle` with sf::find_literal, and only a
+// hit is widened to its enclosing line and handed to confirm(begin, end),
+// which decides whether that line really matches. Lines between hits cannot
+// match and are skipped wholesale (or emitted one by one when inverting).
+template <typename Confirm, typename Emit>
+static void scan_literal(const char* data, size_t size,
+                         const std::string& needle, bool ignore_case,
+                         bool invert, Confirm&& confirm, Emit&& emit) {
+    const char* end = data + size;
+    const char* pos = data;
+    long line_no = 1;
+    // Lines never contain '\n', so such a needle cannot match any of them.
+    bool impossible = needle.find('\n') != std::string::npos;
+
+    while (pos < end) {
+        const char* hit = impossible ? nullptr
+                        : sf::find_literal(pos, end - pos, needle, ignore_case);
+        const char* line_begin = end;
+        const char* line_end = end;
+        if (hit) {
+            auto* nl = static_cast<const char*>(memrchr(pos, '\n', hit - pos));
+            line_begin = nl ? nl + 1 : pos;
+            nl = static_cast<const char*>(std::memchr(hit, '\n', end - hit));
+            line_end = nl ? nl : end;
+        }
+
+        // Lines in [pos, line_begin) contain no match.
+        if (invert) {
+            while (pos < line_begin) {
+                auto* nl = static_cast<const char*>(std::memchr(pos, '\n', line_begin - pos));
+                const char* e = nl ? nl : line_begin;
+                if (!emit(line_no, pos, e)) return;
+                line_no++;
+                pos = nl ? nl + 1 : line_begin;
+            }
+        } else {
+            line_no += sf::count_byte(pos, line_begin - pos, '\n');
+        }
+
+        if (!hit) break;
+        bool match = confirm(line_begin, line_end);
+        if (match != invert && !emit(line_no, line_begin, line_end)) return;
+        line_no++;
+        pos = line_end < end ? line_end + 1 : end;
+    }
+}
+
+// Line-by-line scan for patterns with no usable literal.
+template <typename Match, typename Emit>
+static void scan_lines(const char* data, size_t size, bool invert,
+                       Match&& match, Emit&& emit) {
+    const char* end = data + size;
+    const char* pos = data;
+    long line_no = 1;
+    while (pos < end) {
+        auto* nl = static_cast<const char*>(std::memchr(pos, '\n', end - pos));
+        const char* e = nl ? nl : end;
+        if (match(pos, e) != invert && !emit(line_no, pos, e)) return;
+        line_no++;
+        pos = nl ? nl + 1 : end;
+    }
+}
+
+// A compiled grep pattern. Literal patterns take the SIMD scanner; regexes
+// go through RE2 when it is available and accepts the pattern, and through
+// std::regex otherwise (backreferences, lookahead, ...). A regex that
+// requires some literal is only run on the lines containing it. Matchers are
+// immutable once built and shared through grep_matcher_cache.
+struct GrepMatcher {
+    std::string pattern;
+    bool ignore_case = false;
+    bool literal = false;
+    std::string required;
+#ifdef SHELLFAST_HAVE_RE2
+    std::unique_ptr<RE2> re2;
+#endif
+    std::regex re;
+
+    bool matches_line(const char* begin, const char* end) const {
+#ifdef SHELLFAST_HAVE_RE2
+        if (re2)
+            return RE2::PartialMatch(re2::StringPiece(begin, end - begin), *re2);
+#endif
+        return std::regex_search(begin, end, re);
+    }
+
+    template <typename Emit>
+    void scan(const char* data, size_t size, bool invert, Emit&& emit) const {
+        if (literal) {
+            scan_literal(data, size, pattern, ignore_case, invert,
+                         [](const char*, const char*) { return true; }, emit);
+            return;
+        }
+        auto match = [this](const char* b, const char* e) { return matches_line(b, e); };
+        if (!required.empty())
+            scan_literal(data, size, required, ignore_case, invert, match, emit);
+        else
+            scan_lines(data, size, invert, match, emit);
+    }
+};
+
+static std::shared_ptr<const GrepMatcher> build_grep_matcher(const std::string& pattern,
+                                                             bool ignore_case,
+                                                             bool whole_word) {
+    auto m = std::make_shared<GrepMatcher>();
+    m->pattern = pattern;
+    m->ignore_case = ignore_case;
+    m->literal = !whole_word && is_literal_pattern(pattern);
+    if (m->literal)
+        return m;
+
+    // Two bytes is where skipping lines starts paying for the extra search.
+    m->required = required_literal(pattern, ignore_case);
+    if (m->required.size() < 2)
+        m->required.clear();
+
+    std::string regex_pattern = pattern;
+    if (whole_word)
+        regex_pattern = "\\b" + regex_pattern + "\\b";
+
+#ifdef SHELLFAST_HAVE_RE2
+    // Latin-1 keeps RE2 byte-oriented, like std::regex.
+    RE2::Options opts;
+    opts.set_encoding(RE2::Options::EncodingLatin1);
+    opts.set_case_sensitive(!ignore_case);
+    opts.set_log_errors(false);
+    auto re2 = std::make_unique<RE2>(regex_pattern, opts);
+    if (re2->ok()) {
+        m->re2 = std::move(re2);
+        return m;
+    }
+#endif
+
+    auto flags = std::regex_constants::ECMAScript;
+    if (ignore_case)
+        flags |= std::regex_constants::icase;
+
+    try {
+        m->re = std::regex(regex_pattern, flags);
+    } catch (const std::regex_error& e) {
+        throw py::value_error("grep: invalid regex pattern: " + std::string(e.what()));
+    }
+    return m;
+}
+
+static sf::LruCache<GrepMatcher> grep_matcher_cache(128);
+
+// Returns the compiled matcher for a pattern, reusing one built by an
+// earlier call with the same pattern and flags.
+static std::shared_ptr<const GrepMatcher> make_grep_matcher(const std::string& pattern,
+                                                            bool ignore_case,
+                                                            bool whole_word) {
+    std::string key = pattern;
+    key += '\0';
+    key += ignore_case ? 'i' : '-';
+    key += whole_word ? 'w' : '-';
+    return grep_matcher_cache.get_or_create(key, [&] {
+        return build_grep_matcher(pattern, ignore_case, whole_word);
+    });
+}
+
+// A matching line, pointing into the searched file's mapping.
+struct LineHit {
+    long line_no;
+    const char* begin;
+    const char* end;
+};
+
 static py::object grep_impl(const std::string& pattern,
                               const std::string& path,
                               bool ignore_case,
@@ -160,36 +618,32 @@ static py::object grep_impl(const std::string& pattern,
         }
     };
 
-    collect_files(path);
-
-    // Build regex
-    std::string regex_pattern = pattern;
-    if (whole_word)
-        regex_pattern = "\\b" + regex_pattern + "\\b";
-
-    auto flags = std::regex_constants::ECMAScript;
-    if (ignore_case)
-        flags |= std::regex_constants::icase;
-
-    std::regex re;
-    try {
-        re = std::regex(regex_pattern, flags);
-    } catch (const std::regex_error& e) {
-        throw py::value_error("grep: invalid regex pattern: " + std::string(e.what()));
+    std::shared_ptr<const GrepMatcher> matcher;
+    {
+        py::gil_scoped_release release;
+        collect_files(path);
+        matcher = make_grep_matcher(pattern, ignore_case, whole_word);
     }
 
+    // Runs without the GIL; results are turned into Python objects after.
+    auto search = [&](sf::MappedFile& mf, const std::string& file, auto&& emit) {
+        py::gil_scoped_release release;
+        if (!mf.open(file, /*populate=*/!files_only))
+            throw py::value_error("Cannot open file: " + file);
+        matcher->scan(mf.data(), mf.size(), invert, emit);
+    };
+
     bool multi_file = files_to_search.size() > 1;
 
     if (count_only) {
         py::dict counts;
         for (const auto& file : files_to_search) {
-            auto lines = read_lines(file);
+            sf::MappedFile mf;
             int match_count = 0;
-            for (const auto& line : lines) {
-                bool match = std::regex_search(line, re);
-                if (invert) match = !match;
-                if (match) match_count++;
-            }
+            search(mf, file, [&](long, const char*, const char*) {
+                match_count++;
+                return true;
+            });
             counts[py::cast(file)] = match_count;
         }
         return counts;
@@ -198,44 +652,391 @@ static py::object grep_impl(const std::string& pattern,
     if (files_only) {
         py::list matching_files;
         for (const auto& file : files_to_search) {
-            auto lines = read_lines(file);
-            for (const auto& line : lines) {
-                bool match = std::regex_search(line, re);
-                if (invert) match = !match;
-                if (match) {
-                    matching_files.append(file);
-                    break;
-                }
-            }
+            sf::MappedFile mf;
+            bool found = false;
+            search(mf, file, [&](long, const char*, const char*) {
+                found = true;
+                return false;
+            });
+            if (found)
+                matching_files.append(file);
         }
         return matching_files;
     }
 
     py::list results;
+    std::vector<LineHit> hits;
     for (const auto& file : files_to_search) {
-        auto lines = read_lines(file);
-        for (int i = 0; i < static_cast<int>(lines.size()); i++) {
-            bool match = std::regex_search(lines[i], re);
-            if (invert) match = !match;
-            if (match) {
-                py::dict entry;
-                if (multi_file)
-                    entry["file"] = file;
-                if (line_numbers)
-                    entry["line_number"] = i + 1;
-                entry["line"] = lines[i];
-                results.append(entry);
-            }
+        sf::MappedFile mf;
+        hits.clear();
+        search(mf, file, [&](long line_no, const char* b, const char* e) {
+            hits.push_back({line_no, b, e});
+            return true;
+        });
+        for (const auto& h : hits) {
+            py::dict entry;
+            if (multi_file)
+                entry["file"] = file;
+            if (line_numbers)
+                entry["line_number"] = h.line_no;
+            entry["line"] = py::str(h.begin, static_cast<size_t>(h.end - h.begin));
+            results.append(entry);
         }
     }
 
     return results;
 }
 
+// ---------------------------------------------------------------------------
+// grep_multi — Search for several patterns in one pass
+// ---------------------------------------------------------------------------
+
+#ifdef SHELLFAST_HAVE_HYPERSCAN
+
+// True if no match of `pattern` can contain a '\n'. Hyperscan scans the
+// whole buffer rather than line by line, so a pattern such as "a\sb" or
+// "[^x]" could report a match spanning two lines that neither line has on
+// its own. Anything not known to be safe counts as unsafe, and those
+// patterns are left to the per-line matchers.
+static bool hs_single_line(const std::string& pattern) {
+    static const char* const kSafePosixClasses[] = {
+        "alnum", "alpha", "digit", "lower", "punct", "upper", "word", "xdigit"};
+    const size_t n = pattern.size();
+    const size_t npos = std::string::npos;
+
+    // \d, \w, \S, assertions and escaped punctuation never match '\n'.
+    auto safe_escape = [](char c) {
+        return c != '\n' && (!std::isalnum(static_cast<unsigned char>(c)) ||
+                              std::strchr("dwSbBAzZ", c) != nullptr);
+    };
+
+    for (size_t i = 0; i < n; i++) {
+        char c = pattern[i];
+        if (c == '\n') {
+            return false;
+        } else if (c == '\\') {
+            if (++i >= n || !safe_escape(pattern[i]))
+                return false;
+        } else if (c == '(') {
+            // (?s), (*UCP) and the like change what the rest matches.
+            if (i + 2 < n && ((pattern[i + 1] == '?' && std::isalpha(static_cast<unsigned char>(pattern[i + 2]))) ||
+                              pattern[i + 1] == '*'))
+                return false;
+        } else if (c == '[') {
+            i++;
+            if (i < n && pattern[i] == '^')
+                return false;
+            for (bool first = true; i < n && (pattern[i] != ']' || first); first = false) {
+                char d = pattern[i];
+                if (d == '\n') {
+                    return false;
+                } else if (d == '[' && i + 1 < n && pattern[i + 1] == ':') {
+                    size_t end = pattern.find(":]", i + 2);
+                    if (end == npos)
+                        return false;
+                    std::string name = pattern.substr(i + 2, end - i - 2);
+                    if (std::none_of(std::begin(kSafePosixClasses), std::end(kSafePosixClasses),
+                                     [&](const char* safe) { return name == safe; }))
+                        return false;
+                    i = end + 2;
+                } else if (d == '\\') {
+                    if (i + 1 >= n || !safe_escape(pattern[i + 1]))
+                        return false;
+                    i += 2;
+                } else if (i + 2 < n && pattern[i + 1] == '-' && pattern[i + 2] != ']') {
+                    char hi = pattern[i + 2];
+                    if (hi == '\\' || hi == '[' ||
+                        (static_cast<unsigned char>(d) <= '\n' && static_cast<unsigned char>(hi) >= '\n'))
+                        return false;
+                    i += 3;
+                } else {
+                    i++;
+                }
+            }
+            if (i >= n)
+                return false;
+        }
+        // Everything else is a literal byte, '.' (which skips '\n' without
+        // HS_FLAG_DOTALL), a quantifier, an anchor or '|'.
+    }
+    return true;
+}
+
+static unsigned int hs_pattern_flags(bool ignore_case) {
+    return HS_FLAG_MULTILINE | (ignore_case ? HS_FLAG_CASELESS : 0);
+}
+
+// True if the Hyperscan scan reports `pattern` on exactly the lines a
+// per-line matcher would: it cannot cross a line break, and every match
+// has a last byte to place it on a line (an empty match at the start of a
+// line would otherwise land on the line before).
+static bool hs_can_scan(const std::string& pattern, bool ignore_case) {
+    if (!hs_single_line(pattern))
+        return false;
+    hs_expr_info_t* info = nullptr;
+    hs_compile_error_t* err = nullptr;
+    if (hs_expression_info(pattern.c_str(), hs_pattern_flags(ignore_case), &info, &err) != HS_SUCCESS) {
+        hs_free_compile_error(err);
+        return false;
+    }
+    bool nonempty = info->min_width > 0;
+    std::free(info);
+    return nonempty;
+}
+
+struct HsMatchContext {
+    const std::vector<size_t>* newlines;
+    std::vector<std::vector<size_t>>* lines;  // per pattern, 0-based
+};
+
+static int on_hs_match(unsigned int id, unsigned long long /*from*/,
+                       unsigned long long to, unsigned int /*flags*/, void* ctx) {
+    auto* c = static_cast<HsMatchContext*>(ctx);
+    // Bucket by the line holding the last byte of the match.
+    size_t last = to > 0 ? static_cast<size_t>(to - 1) : 0;
+    size_t line = std::lower_bound(c->newlines->begin(), c->newlines->end(), last) -
+                  c->newlines->begin();
+    auto& v = (*c->lines)[id];
+    if (v.empty() || v.back() != line)
+        v.push_back(line);
+    return 0;
+}
+
+// A compiled pattern set. The database is immutable and shared by
+// concurrent scans, each with its own scratch space.
+struct HsDatabase {
+    hs_database_t* db = nullptr;  // null if the set does not compile
+
+    HsDatabase() = default;
+    HsDatabase(const HsDatabase&) = delete;
+    HsDatabase& operator=(const HsDatabase&) = delete;
+    ~HsDatabase() { hs_free_database(db); }
+};
+
+// Databases can run to megabytes, so fewer are kept than plain matchers.
+static sf::LruCache<HsDatabase> hs_database_cache(32);
+
+// Scan scratch space, one per thread and shared by all databases.
+// hs_alloc_scratch() only reallocates it when a database needs more than it
+// already has, so scans with cached databases allocate nothing.
+struct HsScratch {
+    hs_scratch_t* scratch = nullptr;
+    ~HsScratch() { hs_free_scratch(scratch); }
+};
+
+static thread_local HsScratch hs_scratch;
+
+static std::shared_ptr<const HsDatabase> compile_hs_database(const std::vector<std::string>& patterns,
+                                                             bool ignore_case) {
+    auto compiled = std::make_shared<HsDatabase>();
+    std::vector<const char*> exprs;
+    std::vector<unsigned int> flags, ids;
+    for (size_t i = 0; i < patterns.size(); i++) {
+        exprs.push_back(patterns[i].c_str());
+        flags.push_back(hs_pattern_flags(ignore_case));
+        ids.push_back(static_cast<unsigned int>(i));
+    }
+
+    hs_compile_error_t* err = nullptr;
+    if (hs_compile_multi(exprs.data(), flags.data(), ids.data(),
+                         static_cast<unsigned int>(exprs.size()), HS_MODE_BLOCK,
+                         nullptr, &compiled->db, &err) != HS_SUCCESS) {
+        hs_free_compile_error(err);
+        compiled->db = nullptr;
+    }
+    return compiled;
+}
+
+// Compiles the patterns that hs_can_scan() accepts into one Hyperscan
+// database (or reuses the one from an earlier call with the same set), scans
+// the buffer once and marks those patterns in `done`. Does nothing if no
+// pattern qualifies, the set cannot be compiled (Hyperscan uses PCRE syntax
+// and rejects some constructs) or the buffer is too large for block mode;
+// the caller scans every pattern not marked done on its own.
+static void grep_multi_hyperscan(const std::vector<std::string>& patterns,
+                                 bool ignore_case, const char* data, size_t size,
+                                 std::vector<std::vector<LineHit>>& hits,
+                                 std::vector<char>& done) {
+    if (size > std::numeric_limits<unsigned int>::max())
+        return;
+
+    std::vector<size_t> ids;  // database id -> index into `patterns`
+    std::vector<std::string> exprs;
+    for (size_t i = 0; i < patterns.size(); i++) {
+        if (hs_can_scan(patterns[i], ignore_case)) {
+            ids.push_back(i);
+            exprs.push_back(patterns[i]);
+        }
+    }
+    if (exprs.empty())
+        return;
+
+    // Length-prefixed, so no pattern set can collide with another.
+    std::string key = ignore_case ? "i" : "-";
+    for (const auto& p : exprs) {
+        key += std::to_string(p.size());
+        key += ':';
+        key += p;
+    }
+    auto compiled = hs_database_cache.get_or_create(key, [&] {
+        return compile_hs_database(exprs, ignore_case);
+    });
+    if (!compiled->db)
+        return;
+
+    hs_scratch_t*& scratch = hs_scratch.scratch;
+    if (hs_alloc_scratch(compiled->db, &scratch) != HS_SUCCESS)
+        return;
+
+    std::vector<size_t> newlines;
+    sf::find_all_bytes(data, size, '\n', newlines);
+    std::vector<std::vector<size_t>> lines(exprs.size());
+    HsMatchContext ctx{&newlines, &lines};
+    hs_error_t rc = hs_scan(compiled->db, size ? data : "", static_cast<unsigned int>(size), 0,
+                            scratch, on_hs_match, &ctx);
+    if (rc != HS_SUCCESS)
+        return;
+
+    const char* end = data + size;
+    for (size_t id = 0; id < lines.size(); id++) {
+        auto& v = lines[id];
+        std::sort(v.begin(), v.end());
+        v.erase(std::unique(v.begin(), v.end()), v.end());
+        for (size_t line : v) {
+            const char* b = line == 0 ? data : data + newlines[line - 1] + 1;
+            const char* e = line < newlines.size() ? data + newlines[line] : end;
+            hits[ids[id]].push_back({static_cast<long>(line) + 1, b, e});
+        }
+        done[ids[id]] = 1;
+    }
+}
+
+#endif
+
+static py::dict grep_multi_impl(const std::vector<std::string>& patterns,
+                                const std::string& path,
+                                bool ignore_case) {
+    sf::MappedFile mf;
+    std::vector<std::vector<LineHit>> hits(patterns.size());
+    {
+        py::gil_scoped_release release;
+        if (!mf.open(path, /*populate=*/true))
+            throw py::value_error("grep: " + path + ": No such file or directory");
+
+        std::vector<char> done(patterns.size(), 0);
+#ifdef SHELLFAST_HAVE_HYPERSCAN
+        grep_multi_hyperscan(patterns, ignore_case, mf.data(), mf.size(), hits, done);
+#endif
+        // The file is mapped once and scanned once per remaining pattern.
+        for (size_t i = 0; i < patterns.size(); i++) {
+            if (!done[i]) {
+                auto matcher = make_grep_matcher(patterns[i], ignore_case, false);
+                matcher->scan(mf.data(), mf.size(), false,
+                              [&](long line_no, const char* b, const char* e) {
+                                  hits[i].push_back({line_no, b, e});
+                                  return true;
+                              });
+            }
+        }
+    }
+
+    py::dict result;
+    for (size_t i = 0; i < patterns.size(); i++) {
+        py::list matches;
+        for (const auto& h : hits[i]) {
+            py::dict entry;
+            entry["line_number"] = h.line_no;
+            entry["line"] = py::str(h.begin, static_cast<size_t>(h.end - h.begin));
+            matches.append(entry);
+        }
+        result[py::str(patterns[i])] = matches;
+    }
+    return result;
+}
+
 // ---------------------------------------------------------------------------
 // sort — Sort lines of a file
 // ---------------------------------------------------------------------------
 
+// Parses a whole sort key as a decimal integer: an optional '-' followed by
+// 1-18 digits, so the value always fits in an int64_t. Returns false for
+// anything else, which sends the caller down the generic stod() path.
+static bool parse_int_key(std::string_view s, int64_t& out) {
+    bool neg = !s.empty() && s[0] == '-';
+    if (neg)
+        s.remove_prefix(1);
+    uint64_t v;
+    if (s.size() > 18 || !sf::parse_digits(s.data(), s.size(), v))
+        return false;
+    out = neg ? -static_cast<int64_t>(v) : static_cast<int64_t>(v);
+    return true;
+}
+
+// Stable LSD radix sort of (key, line index) pairs, 16 key bits per pass.
+// Passes in which every key falls into the same bucket are skipped.
+static void radix_sort_keys(std::vector<std::pair<int64_t, uint32_t>>& keys) {
+    constexpr size_t kBuckets = 1 << 16;
+    const size_t n = keys.size();
+
+    // Flip the sign bit so signed order matches unsigned order.
+    auto digit = [](int64_t k, int pass) {
+        uint64_t u = static_cast<uint64_t>(k) ^ (uint64_t{1} << 63);
+        return static_cast<size_t>((u >> (16 * pass)) & 0xFFFF);
+    };
+
+    std::vector<uint32_t> hist(4 * kBuckets, 0);
+    for (const auto& k : keys)
+        for (int pass = 0; pass < 4; pass++)
+            hist[pass * kBuckets + digit(k.first, pass)]++;
+
+    std::vector<std::pair<int64_t, uint32_t>> tmp(n);
+    for (int pass = 0; pass < 4; pass++) {
+        uint32_t* h = &hist[pass * kBuckets];
+        if (h[digit(keys[0].first, pass)] == n)
+            continue;
+        uint32_t sum = 0;
+        for (size_t b = 0; b < kBuckets; b++) {
+            uint32_t c = h[b];
+            h[b] = sum;
+            sum += c;
+        }
+        for (const auto& k : keys)
+            tmp[h[digit(k.first, pass)]++] = k;
+        keys.swap(tmp);
+    }
+}
+
+// Numeric sort fast path: when every key is a plain integer, parse each key
+// once and radix-sort the lines, instead of re-parsing both keys on every
+// comparison. Returns false (leaving `lines` untouched) otherwise.
+template <typename KeyOf>
+static bool sort_integer_keys(std::vector<std::string_view>& lines, KeyOf&& key_of) {
+    if (lines.empty() || lines.size() > UINT32_MAX)
+        return false;
+
+    std::vector<std::pair<int64_t, uint32_t>> keys;
+    keys.reserve(lines.size());
+    int64_t v;
+    for (size_t i = 0; i < lines.size(); i++) {
+        if (!parse_int_key(key_of(lines[i]), v))
+            return false;
+        keys.emplace_back(v, static_cast<uint32_t>(i));
+    }
+
+    if (keys.size() < 256)
+        std::stable_sort(keys.begin(), keys.end(),
+                         [](const auto& a, const auto& b) { return a.first < b.first; });
+    else
+        radix_sort_keys(keys);
+
+    std::vector<std::string_view> ordered;
+    ordered.reserve(lines.size());
+    for (const auto& k : keys)
+        ordered.push_back(lines[k.second]);
+    lines.swap(ordered);
+    return true;
+}
+
 static std::string sort_impl(const std::string& path,
                                bool reverse,
                                bool numeric,
@@ -243,34 +1044,38 @@ static std::string sort_impl(const std::string& path,
                                int key,
                                const std::string& separator,
                                bool ignore_case) {
-    auto lines = read_lines(path);
+    sf::MappedFile mf;
+    auto lines = read_lines(mf, path);
 
-    auto get_key = [&](const std::string& line) -> std::string {
-        if (key <= 0) return line;
-        std::istringstream iss(line);
+    auto get_key = [&](std::string_view line) -> std::string {
+        if (key <= 0) return std::string(line);
         std::string token;
         char sep = separator.empty() ? ' ' : separator[0];
 
         if (separator.empty()) {
+            std::istringstream iss{std::string(line)};
             for (int i = 0; i < key; i++) {
                 if (!(iss >> token)) return "";
             }
         } else {
-            std::string temp = line;
+            std::string_view temp = line;
             for (int i = 1; i < key; i++) {
                 auto pos = temp.find(sep);
-                if (pos == std::string::npos) return "";
-                temp = temp.substr(pos + 1);
+                if (pos == std::string_view::npos) return "";
+                temp.remove_prefix(pos + 1);
             }
-            auto pos = temp.find(sep);
-            token = (pos != std::string::npos) ? temp.substr(0, pos) : temp;
+            token = std::string(temp.substr(0, temp.find(sep)));
         }
         return token;
     };
 
-    if (numeric) {
+    auto whole_line = [](std::string_view line) { return line; };
+    if (numeric && (key <= 0 ? sort_integer_keys(lines, whole_line)
+                             : sort_integer_keys(lines, get_key))) {
+        // Every key was a plain integer; lines are already in order.
+    } else if (numeric) {
         std::sort(lines.begin(), lines.end(),
-                  [&](const std::string& a, const std::string& b) {
+                  [&](std::string_view a, std::string_view b) {
                       try {
                           double va = std::stod(get_key(a));
                           double vb = std::stod(get_key(b));
@@ -281,15 +1086,17 @@ static std::string sort_impl(const std::string& path,
                   });
     } else if (ignore_case) {
         std::sort(lines.begin(), lines.end(),
-                  [&](const std::string& a, const std::string& b) {
+                  [&](std::string_view a, std::string_view b) {
                       std::string ka = get_key(a), kb = get_key(b);
                       std::transform(ka.begin(), ka.end(), ka.begin(), ::tolower);
                       std::transform(kb.begin(), kb.end(), kb.begin(), ::tolower);
                       return ka < kb;
                   });
+    } else if (key <= 0) {
+        std::sort(lines.begin(), lines.end());
     } else {
         std::sort(lines.begin(), lines.end(),
-                  [&](const std::string& a, const std::string& b) {
+                  [&](std::string_view a, std::string_view b) {
                       return get_key(a) < get_key(b);
                   });
     }
@@ -301,10 +1108,16 @@ static std::string sort_impl(const std::string& path,
         lines.erase(std::unique(lines.begin(), lines.end()), lines.end());
     }
 
-    std::ostringstream oss;
+    size_t total = 0;
     for (const auto& line : lines)
-        oss << line << "\n";
-    return oss.str();
+        total += line.size() + 1;
+    std::string out;
+    out.reserve(total);
+    for (const auto& line : lines) {
+        out += line;
+        out += '\n';
+    }
+    return out;
 }
 
 // ---------------------------------------------------------------------------
@@ -313,54 +1126,100 @@ static std::string sort_impl(const std::string& path,
 
 static std::string diff_impl(const std::string& file1, const std::string& file2,
                                bool unified, int context_lines) {
-    auto lines1 = read_lines(file1);
-    auto lines2 = read_lines(file2);
+    sf::MappedFile mf1, mf2;
+    if (!mf1.open(file1, /*populate=*/true))
+        throw py::value_error("Cannot open file: " + file1);
+    if (!mf2.open(file2, /*populate=*/true))
+        throw py::value_error("Cannot open file: " + file2);
+    std::vector<std::string_view> lines1, lines2;
+    split_lines(mf1.data(), mf1.size(), lines1);
+    split_lines(mf2.data(), mf2.size(), lines2);
 
     int n = static_cast<int>(lines1.size());
     int m = static_cast<int>(lines2.size());
 
-    // LCS-based diff using dynamic programming
-    std::vector<std::vector<int>> dp(n + 1, std::vector<int>(m + 1, 0));
-    for (int i = 1; i <= n; i++) {
-        for (int j = 1; j <= m; j++) {
-            if (lines1[i - 1] == lines2[j - 1])
-                dp[i][j] = dp[i - 1][j - 1] + 1;
+    // Lines shared at the start and end need no table. The backtrack below
+    // takes a common suffix diagonally anyway, and within a common prefix
+    // of length k the LCS of two prefixes is simply min(i, j), so the
+    // output is exactly that of the full table.
+    int k = 0;
+    while (k < n && k < m && lines1[k] == lines2[k])
+        k++;
+    int s = 0;
+    while (s < n - k && s < m - k && lines1[n - 1 - s] == lines2[m - 1 - s])
+        s++;
+
+    // Intern the remaining lines so the table compares ints, not strings.
+    std::unordered_map<std::string_view, int> ids;
+    std::vector<int> a(n), b(m);
+    for (int i = k; i < n - s; i++)
+        a[i] = ids.emplace(lines1[i], static_cast<int>(ids.size())).first->second;
+    for (int j = k; j < m - s; j++)
+        b[j] = ids.emplace(lines2[j], static_cast<int>(ids.size())).first->second;
+
+    // LCS table over the middle, in one flat allocation.
+    int rows = n - s - k, cols = m - s - k;
+    std::vector<int> dp(static_cast<size_t>(rows + 1) * (cols + 1), 0);
+    auto cell = [&](int i, int j) -> int& {
+        return dp[static_cast<size_t>(i) * (cols + 1) + j];
+    };
+    for (int i = 1; i <= rows; i++) {
+        int ai = a[k + i - 1];
+        for (int j = 1; j <= cols; j++) {
+            if (ai == b[k + j - 1])
+                cell(i, j) = cell(i - 1, j - 1) + 1;
             else
-                dp[i][j] = std::max(dp[i - 1][j], dp[i][j - 1]);
+                cell(i, j) = std::max(cell(i - 1, j), cell(i, j - 1));
         }
     }
+    // LCS of lines1[0, i) and lines2[0, j) for i <= n - s, j <= m - s.
+    auto lcs = [&](int i, int j) -> int {
+        if (i <= k || j <= k) return std::min(i, j);
+        return k + cell(i - k, j - k);
+    };
+    auto same = [&](int i, int j) {
+        if (i >= k && j >= k && i < n - s && j < m - s)
+            return a[i] == b[j];
+        return lines1[i] == lines2[j];
+    };
 
     // Backtrack to find diff
-    struct DiffLine { char type; std::string text; int line1; int line2; };
+    struct DiffLine { char type; std::string_view text; };
     std::vector<DiffLine> diffs;
-    int i = n, j = m;
+    diffs.reserve(n + m);
+    for (int t = 0; t < s; t++)
+        diffs.push_back({' ', lines1[n - 1 - t]});
+    int i = n - s, j = m - s;
     while (i > 0 || j > 0) {
-        if (i > 0 && j > 0 && lines1[i - 1] == lines2[j - 1]) {
-            diffs.push_back({' ', lines1[i - 1], i, j});
+        if (i > 0 && j > 0 && same(i - 1, j - 1)) {
+            diffs.push_back({' ', lines1[i - 1]});
             i--; j--;
-        } else if (j > 0 && (i == 0 || dp[i][j - 1] >= dp[i - 1][j])) {
-            diffs.push_back({'+', lines2[j - 1], 0, j});
+        } else if (j > 0 && (i == 0 || lcs(i, j - 1) >= lcs(i - 1, j))) {
+            diffs.push_back({'+', lines2[j - 1]});
             j--;
         } else {
-            diffs.push_back({'-', lines1[i - 1], i, 0});
+            diffs.push_back({'-', lines1[i - 1]});
             i--;
         }
     }
     std::reverse(diffs.begin(), diffs.end());
 
-    std::ostringstream oss;
+    std::string out;
     if (unified) {
-        oss << "--- " << file1 << "\n";
-        oss << "+++ " << file2 << "\n";
+        out += "--- " + file1 + "\n";
+        out += "+++ " + file2 + "\n";
     }
 
     for (const auto& d : diffs) {
         if (d.type != ' ' || unified) {
-            oss << d.type << " " << d.text << "\n";
+            out += d.type;
+            out += ' ';
+            out += d.text;
+            out += '\n';
         }
     }
 
-    return oss.str();
+    return out;
 }
 
 // ---------------------------------------------------------------------------
@@ -369,32 +1228,35 @@ static std::string diff_impl(const std::string& file1, const std::string& file2,
 
 static py::dict cmp_impl(const std::string& file1, const std::string& file2,
                            bool silent) {
-    std::ifstream ifs1(file1, std::ios::binary);
-    std::ifstream ifs2(file2, std::ios::binary);
-    if (!ifs1.is_open())
-        throw py::value_error("cmp: " + file1 + ": No such file or directory");
-    if (!ifs2.is_open())
-        throw py::value_error("cmp: " + file2 + ": No such file or directory");
-
     long byte_offset = 0;
     int line_number = 1;
     bool identical = true;
-
-    char c1, c2;
-    while (ifs1.get(c1) && ifs2.get(c2)) {
-        byte_offset++;
-        if (c1 == '\n') line_number++;
-        if (c1 != c2) {
+    {
+        py::gil_scoped_release release;
+        sf::MappedFile m1, m2;
+        if (!m1.open(file1))
+            throw py::value_error("cmp: " + file1 + ": No such file or directory");
+        if (!m2.open(file2))
+            throw py::value_error("cmp: " + file2 + ": No such file or directory");
+
+        // Without a report, a size difference settles it.
+        if (silent && m1.size() != m2.size()) {
             identical = false;
-            break;
+        } else {
+            size_t n = std::min(m1.size(), m2.size());
+            size_t i = sf::first_mismatch(m1.data(), m2.data(), n);
+            if (i < n || m1.size() != m2.size()) {
+                // A shorter file differs at the byte just past its end. Line
+                // numbers count the newlines of file1 up to and including
+                // the differing byte.
+                identical = false;
+                byte_offset = static_cast<long>(i) + 1;
+                line_number = 1 + static_cast<int>(
+                    sf::count_byte(m1.data(), std::min(i + 1, n), '\n'));
+            }
         }
     }
 
-    if (identical && (ifs1.get(c1) || ifs2.get(c2))) {
-        identical = false;
-        byte_offset++;
-    }
-
     py::dict result;
     result["identical"] = identical;
     if (!identical && !silent) {
@@ -412,24 +1274,39 @@ static py::dict cmp_impl(const std::string& file1, const std::string& file2,
 // ---------------------------------------------------------------------------
 
 static py::dict comm_impl(const std::string& file1, const std::string& file2) {
-    auto lines1 = read_lines(file1);
-    auto lines2 = read_lines(file2);
-
-    std::set<std::string> set1(lines1.begin(), lines1.end());
-    std::set<std::string> set2(lines2.begin(), lines2.end());
+    sf::MappedFile mf1, mf2;
+    std::vector<std::string_view> lines1, lines2;
+    {
+        py::gil_scoped_release release;
+        if (!mf1.open(file1, /*populate=*/true))
+            throw py::value_error("Cannot open file: " + file1);
+        if (!mf2.open(file2, /*populate=*/true))
+            throw py::value_error("Cannot open file: " + file2);
+        split_lines(mf1.data(), mf1.size(), lines1);
+        split_lines(mf2.data(), mf2.size(), lines2);
+        for (auto* lines : {&lines1, &lines2}) {
+            std::sort(lines->begin(), lines->end());
+            lines->erase(std::unique(lines->begin(), lines->end()), lines->end());
+        }
+    }
 
+    // Both sides are sorted and unique: one merge pass classifies every line.
     py::list only_in_1, only_in_2, in_both;
-
-    for (const auto& line : set1) {
-        if (set2.count(line))
-            in_both.append(line);
-        else
-            only_in_1.append(line);
-    }
-    for (const auto& line : set2) {
-        if (!set1.count(line))
-            only_in_2.append(line);
+    size_t i = 0, j = 0;
+    while (i < lines1.size() && j < lines2.size()) {
+        if (lines1[i] < lines2[j]) {
+            only_in_1.append(py::str(lines1[i++]));
+        } else if (lines2[j] < lines1[i]) {
+            only_in_2.append(py::str(lines2[j++]));
+        } else {
+            in_both.append(py::str(lines1[i++]));
+            j++;
+        }
     }
+    for (; i < lines1.size(); i++)
+        only_in_1.append(py::str(lines1[i]));
+    for (; j < lines2.size(); j++)
+        only_in_2.append(py::str(lines2[j]));
 
     py::dict result;
     result["only_in_first"]  = only_in_1;
@@ -447,23 +1324,23 @@ static py::dict wc_impl(const std::string& path,
                           bool words_only,
                           bool chars_only,
                           bool bytes_only) {
-    std::ifstream ifs(path, std::ios::binary);
-    if (!ifs.is_open())
-        throw py::value_error("wc: " + path + ": No such file or directory");
-
+    // Byte and char counts only need the size; line-only counts skip the
+    // whitespace classification.
+    bool size_only = (bytes_only || chars_only) && !lines_only && !words_only;
     long line_count = 0, word_count = 0, char_count = 0, byte_count = 0;
-    bool in_word = false;
-
-    char c;
-    while (ifs.get(c)) {
-        byte_count++;
-        char_count++;
-        if (c == '\n') line_count++;
-        if (std::isspace(static_cast<unsigned char>(c))) {
-            in_word = false;
-        } else if (!in_word) {
-            in_word = true;
-            word_count++;
+    {
+        py::gil_scoped_release release;
+        sf::MappedFile mf;
+        if (!mf.open(path, /*populate=*/!size_only))
+            throw py::value_error("wc: " + path + ": No such file or directory");
+
+        char_count = byte_count = static_cast<long>(mf.size());
+        if (lines_only) {
+            line_count = static_cast<long>(sf::count_byte(mf.data(), mf.size(), '\n'));
+        } else if (!size_only) {
+            auto counts = sf::count_lines_words(mf.data(), mf.size());
+            line_count = static_cast<long>(counts.lines);
+            word_count = static_cast<long>(counts.words);
         }
     }
 
@@ -489,7 +1366,6 @@ static py::dict wc_impl(const std::string& path,
 static std::string cut_impl(const std::string& path,
                               const std::string& delimiter,
                               const std::string& fields) {
-    auto lines = read_lines(path);
     char sep = delimiter.empty() ? '\t' : delimiter[0];
 
     // Parse fields like "1,3" or "1-3" or "2"
@@ -508,25 +1384,56 @@ static std::string cut_impl(const std::string& path,
         }
     }
 
-    std::ostringstream oss;
-    for (const auto& line : lines) {
-        std::vector<std::string> tokens;
-        std::istringstream lss(line);
-        std::string token;
-        while (std::getline(lss, token, sep))
-            tokens.push_back(token);
+    sf::MappedFile mf;
+    if (!mf.open(path, /*populate=*/true))
+        throw py::value_error("Cannot open file: " + path);
+    const char* data = mf.data();
+    size_t size = mf.size();
+
+    // Newlines and delimiters are located together, one block at a time,
+    // and each line is cut from the delimiter offsets recorded for it.
+    std::string out;
+    out.reserve(size + 1);
+    std::vector<size_t> cuts;  // delimiter offsets in the current line
+    size_t line_start = 0;
+
+    auto emit_line = [&](size_t line_end) {
+        size_t ntokens = cuts.size() + 1;
+        size_t last_start = cuts.empty() ? line_start : cuts.back() + 1;
+        if (last_start == line_end)
+            ntokens--;  // like getline(), no empty field after a trailing delimiter
 
         bool first = true;
         for (int f : field_set) {
-            if (f >= 1 && f <= static_cast<int>(tokens.size())) {
-                if (!first) oss << sep;
-                oss << tokens[f - 1];
-                first = false;
+            if (f < 1 || static_cast<size_t>(f) > ntokens) continue;
+            size_t b = f == 1 ? line_start : cuts[f - 2] + 1;
+            size_t e = static_cast<size_t>(f) <= cuts.size() ? cuts[f - 1] : line_end;
+            if (!first) out.push_back(sep);
+            out.append(data + b, e - b);
+            first = false;
+        }
+        out.push_back('\n');
+        cuts.clear();
+    };
+
+    constexpr size_t kBlock = 1 << 16;
+    std::vector<size_t> hits;
+    for (size_t base = 0; base < size; base += kBlock) {
+        hits.clear();
+        sf::find_all_bytes(data + base, std::min(kBlock, size - base), '\n', sep, hits);
+        for (size_t h : hits) {
+            size_t pos = base + h;
+            if (data[pos] == '\n') {
+                emit_line(pos);
+                line_start = pos + 1;
+            } else {
+                cuts.push_back(pos);
             }
         }
-        oss << "\n";
     }
-    return oss.str();
+    if (line_start < size)
+        emit_line(size);
+    return out;
 }
 
 // ---------------------------------------------------------------------------
@@ -535,11 +1442,12 @@ static std::string cut_impl(const std::string& path,
 
 static std::string paste_impl(const std::vector<std::string>& files,
                                 const std::string& delimiter) {
-    std::vector<std::vector<std::string>> all_lines;
+    std::vector<sf::MappedFile> mapped(files.size());
+    std::vector<std::vector<std::string_view>> all_lines;
     size_t max_lines = 0;
 
-    for (const auto& file : files) {
-        auto lines = read_lines(file);
+    for (size_t f = 0; f < files.size(); f++) {
+        auto lines = read_lines(mapped[f], files[f]);
         max_lines = std::max(max_lines, lines.size());
         all_lines.push_back(std::move(lines));
     }
@@ -566,32 +1474,32 @@ static std::string paste_impl(const std::vector<std::string>& files,
 static std::string join_impl(const std::string& file1, const std::string& file2,
                                int field1, int field2,
                                const std::string& separator) {
-    auto lines1 = read_lines(file1);
-    auto lines2 = read_lines(file2);
+    sf::MappedFile mf1, mf2;
+    auto lines1 = read_lines(mf1, file1);
+    auto lines2 = read_lines(mf2, file2);
     char sep = separator.empty() ? ' ' : separator[0];
 
-    auto get_field = [&](const std::string& line, int field) -> std::string {
-        std::istringstream iss(line);
+    auto get_field = [&](std::string_view line, int field) -> std::string {
         std::string token;
         if (sep == ' ') {
+            std::istringstream iss{std::string(line)};
             for (int i = 0; i < field; i++) {
                 if (!(iss >> token)) return "";
             }
         } else {
-            std::string temp = line;
+            std::string_view temp = line;
             for (int i = 1; i < field; i++) {
                 auto pos = temp.find(sep);
-                if (pos == std::string::npos) return "";
-                temp = temp.substr(pos + 1);
+                if (pos == std::string_view::npos) return "";
+                temp.remove_prefix(pos + 1);
             }
-            auto pos = temp.find(sep);
-            token = (pos != std::string::npos) ? temp.substr(0, pos) : temp;
+            token = std::string(temp.substr(0, temp.find(sep)));
         }
         return token;
     };
 
     // Build index on file2
-    std::multimap<std::string, std::string> index2;
+    std::multimap<std::string, std::string_view> index2;
     for (const auto& line : lines2) {
         std::string key = get_field(line, field2);
         index2.emplace(key, line);
@@ -682,7 +1590,8 @@ void init_text(py::module_ &m) {
         )doc",
         py::arg("path"),
         py::arg("n") = 10,
-        py::arg("bytes") = -1);
+        py::arg("bytes") = -1,
+        py::call_guard<py::gil_scoped_release>());
 
     // -- tail ---------------------------------------------------------------
     m.def("tail", &tail_impl,
@@ -707,7 +1616,8 @@ void init_text(py::module_ &m) {
         )doc",
         py::arg("path"),
         py::arg("n") = 10,
-        py::arg("bytes") = -1);
+        py::arg("bytes") = -1,
+        py::call_guard<py::gil_scoped_release>());
 
     // -- grep ---------------------------------------------------------------
     m.def("grep", &grep_impl,
@@ -751,6 +1661,34 @@ void init_text(py::module_ &m) {
         py::arg("files_only") = false,
         py::arg("whole_word") = false);
 
+    // -- grep_multi ---------------------------------------------------------
+    m.def("grep_multi", &grep_multi_impl,
+        R"doc(
+        Search a file for several patterns in one call.
+
+        Equivalent to ``grep -e PAT1 -e PAT2 ...``, but reports the matching
+        lines of each pattern separately. When built with Hyperscan, all
+        patterns are compiled into one database and the file is scanned in a
+        single pass (patterns then use PCRE syntax); otherwise the file is
+        mapped once and searched once per pattern.
+
+        Args:
+            patterns (list[str]): Regular expression patterns to search for.
+            path (str): File to search in.
+            ignore_case (bool): If True, perform case-insensitive matching.
+                                Equivalent to ``grep -i``.
+
+        Returns:
+            dict[str, list[dict]]: Maps each pattern to its matching lines, as
+                                   dicts with keys "line_number" and "line".
+
+        Raises:
+            ValueError: If the file doesn't exist or a pattern is invalid.
+        )doc",
+        py::arg("patterns"),
+        py::arg("path"),
+        py::arg("ignore_case") = false);
+
     // -- sort ---------------------------------------------------------------
     m.def("sort_file", &sort_impl,
         R"doc(
@@ -786,7 +1724,8 @@ void init_text(py::module_ &m) {
         py::arg("unique") = false,
         py::arg("key") = 0,
         py::arg("separator") = "",
-        py::arg("ignore_case") = false);
+        py::arg("ignore_case") = false,
+        py::call_guard<py::gil_scoped_release>());
 
     // -- diff ---------------------------------------------------------------
     m.def("diff", &diff_impl,
@@ -812,7 +1751,8 @@ void init_text(py::module_ &m) {
         py::arg("file1"),
         py::arg("file2"),
         py::arg("unified") = true,
-        py::arg("context_lines") = 3);
+        py::arg("context_lines") = 3,
+        py::call_guard<py::gil_scoped_release>());
 
     // -- cmp ----------------------------------------------------------------
     m.def("cmp", &cmp_impl,
@@ -917,7 +1857,8 @@ void init_text(py::module_ &m) {
         )doc",
         py::arg("path"),
         py::arg("delimiter") = "\t",
-        py::arg("fields") = "1");
+        py::arg("fields") = "1",
+        py::call_guard<py::gil_scoped_release>());
 
     // -- paste --------------------------------------------------------------
     m.def("paste", &paste_impl,
@@ -939,7 +1880,8 @@ void init_text(py::module_ &m) {
             ValueError: If any file cannot be opened.
         )doc",
         py::arg("files"),
-        py::arg("delimiter") = "\t");
+        py::arg("delimiter") = "\t",
+        py::call_guard<py::gil_scoped_release>());
 
     // -- join ---------------------------------------------------------------
     m.def("join", &join_impl,
@@ -969,5 +1911,6 @@ void init_text(py::module_ &m) {
         py::arg("file2"),
         py::arg("field1") = 1,
         py::arg("field2") = 1,
-        py::arg("separator") = "");
+        py::arg("separator") = "",
+        py::call_guard<py::gil_scoped_release>());
 }
@@ -76,6 +76,17 @@ class TestLs:
             assert "permissions" in result[0]
             assert "size" in result[0]
 
+    def test_long_format_large_directory(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(100):
+                with open(os.path.join(tmpdir, "f%03d" % i), "w") as f:
+                    f.write("x" * i)
+            os.symlink("/nonexistent_12345", os.path.join(tmpdir, "dangling"))
+            result = sf.ls(tmpdir, long_format=True)
+            sizes = {e["name"]: e["size"] for e in result}
+            assert all(sizes["f%03d" % i] == i for i in range(100))
+            assert [e["type"] for e in result if e["name"] == "dangling"] == ["l"]
+
     def test_sort_by_name(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             for name in ["ccc", "aaa", "bbb"]:
@@ -83,6 +94,14 @@ class TestLs:
             result = sf.ls(tmpdir, sort_by="name")
             assert result == ["aaa", "bbb", "ccc"]
 
+    def test_recursive(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sf.mkdir(os.path.join(tmpdir, "sub"))
+            sf.touch(os.path.join(tmpdir, "sub", "inner.txt"))
+            sf.touch(os.path.join(tmpdir, "outer.txt"))
+            result = sf.ls(tmpdir, recursive=True)
+            assert sorted(result) == ["inner.txt", "outer.txt", "sub"]
+
     def test_nonexistent_raises(self):
         with pytest.raises(ValueError):
             sf.ls("/nonexistent_12345")
@@ -135,6 +154,77 @@ class TestCpAndMv:
             with open(dst) as f:
                 assert f.read() == "hello"
 
+    def test_copy_large_file_into_directory(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = os.path.join(tmpdir, "src.bin")
+            data = os.urandom(3 * 1024 * 1024 + 17)
+            with open(src, "wb") as f:
+                f.write(data)
+            os.chmod(src, 0o750)
+            os.mkdir(os.path.join(tmpdir, "out"))
+            sf.cp(src, os.path.join(tmpdir, "out"))
+            dst = os.path.join(tmpdir, "out", "src.bin")
+            with open(dst, "rb") as f:
+                assert f.read() == data
+            assert os.stat(dst).st_mode & 0o777 == 0o750
+
+    def test_copy_reflink_modes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = os.path.join(tmpdir, "src.txt")
+            with open(src, "w") as f:
+                f.write("hello")
+            for mode in ("auto", "never"):
+                dst = os.path.join(tmpdir, mode + ".txt")
+                sf.cp(src, dst, reflink=mode)
+                with open(dst) as f:
+                    assert f.read() == "hello"
+
+            # Cloning depends on the filesystem; either way no partial copy is left.
+            dst = os.path.join(tmpdir, "always.txt")
+            try:
+                sf.cp(src, dst, reflink="always")
+            except RuntimeError:
+                assert not os.path.exists(dst)
+            else:
+                with open(dst) as f:
+                    assert f.read() == "hello"
+
+            with pytest.raises(ValueError):
+                sf.cp(src, os.path.join(tmpdir, "bad.txt"), reflink="sometimes")
+
+    def test_copy_tree_reflink_modes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = os.path.join(tmpdir, "src")
+            os.makedirs(os.path.join(src, "sub"))
+            for name, data in (("a.txt", "top"), (os.path.join("sub", "b.txt"), "nested")):
+                with open(os.path.join(src, name), "w") as f:
+                    f.write(data)
+            os.symlink("a.txt", os.path.join(src, "link"))
+
+            def contents(root):
+                out = {}
+                for dirpath, _, files in os.walk(root):
+                    for name in files:
+                        path = os.path.join(dirpath, name)
+                        with open(path) as f:
+                            out[os.path.relpath(path, root)] = (os.path.islink(path), f.read())
+                return out
+
+            expected = contents(src)
+            for mode in ("auto", "never"):
+                dst = os.path.join(tmpdir, mode)
+                sf.cp(src, dst, recursive=True, preserve=True, reflink=mode)
+                assert contents(dst) == expected
+
+            # "always" applies to every file in the tree, not just a lone file.
+            dst = os.path.join(tmpdir, "always")
+            try:
+                sf.cp(src, dst, recursive=True, preserve=True, reflink="always")
+            except RuntimeError:
+                assert not os.path.exists(os.path.join(dst, "a.txt"))
+            else:
+                assert contents(dst) == expected
+
     def test_move_file(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             src = os.path.join(tmpdir, "src.txt")
@@ -183,6 +273,14 @@ class TestFind:
             assert len(dirs) == 1
             assert len(files) == 1
 
+    def test_find_max_depth(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sf.mkdir(os.path.join(tmpdir, "a", "b"), parents=True)
+            sf.touch(os.path.join(tmpdir, "a", "top.txt"))
+            sf.touch(os.path.join(tmpdir, "a", "b", "deep.txt"))
+            result = sf.find(tmpdir, name="*.txt", max_depth=1)
+            assert [os.path.basename(p) for p in result] == ["top.txt"]
+
 
 class TestDu:
     def test_summary(self):
@@ -194,6 +292,18 @@ class TestDu:
             assert "bytes" in result
             assert result["bytes"] >= 100
 
+    def test_many_subdirectories(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(12):
+                sub = os.path.join(tmpdir, "d%d" % i, "nested")
+                sf.mkdir(sub, parents=True)
+                with open(os.path.join(sub, "f.txt"), "w") as f:
+                    f.write("x" * (i + 1))
+            assert sf.du(tmpdir)["bytes"] == sum(range(1, 13))
+            per_dir = sf.du(tmpdir, summary_only=False)
+            assert len(per_dir) == 12
+            assert sum(d["bytes"] for d in per_dir) == sum(range(1, 13))
+
 
 class TestChmod:
     def test_change_permissions(self):
@@ -203,3 +313,41 @@ class TestChmod:
             sf.chmod(path, 0o644)
             mode = os.stat(path).st_mode & 0o777
             assert mode == 0o644
+
+
+class TestBatched:
+    def test_touch_stat_rm_many(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = [os.path.join(tmpdir, "f%d" % i) for i in range(1500)]
+            sf.touch_many(paths)
+            assert all(os.path.isfile(p) for p in paths)
+
+            missing = os.path.join(tmpdir, "missing")
+            infos = sf.stat_many([paths[0], tmpdir, missing])
+            assert infos[0]["size"] == 0 and infos[0]["type"] == "-"
+            assert infos[1]["is_directory"]
+            assert infos[2] is None
+
+            sf.rm_many(paths)
+            assert os.listdir(tmpdir) == []
+
+    def test_touch_many_no_create_and_errors(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a")
+            sf.touch_many([path], no_create=True)
+            assert not os.path.exists(path)
+            with pytest.raises(ValueError):
+                sf.touch_many([path, os.path.join(tmpdir, "no", "such")])
+            assert os.path.exists(path)
+
+    def test_rm_many_errors(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sub = os.path.join(tmpdir, "sub")
+            os.mkdir(sub)
+            sf.touch(os.path.join(sub, "x"))
+            with pytest.raises(ValueError):
+                sf.rm_many([sub])
+            with pytest.raises(ValueError):
+                sf.rm_many([os.path.join(tmpdir, "missing")])
+            sf.rm_many([sub, os.path.join(tmpdir, "missing")], recursive=True, force=True)
+            assert not os.path.exists(sub)
@@ -101,6 +101,17 @@ class TestSleep:
         elapsed = time.time() - start
         assert elapsed >= 0.09
 
+    def test_releases_gil(self):
+        import threading
+        import time
+        threads = [threading.Thread(target=sf.sleep, args=(0.2,)) for _ in range(4)]
+        start = time.time()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert time.time() - start < 0.6
+
 
 class TestId:
     def test_current_user(self):
@@ -144,6 +155,13 @@ class TestPs:
         pids = [p["pid"] for p in result]
         assert pid in pids
 
+    def test_current_process_fields(self):
+        me = next(p for p in sf.ps() if p["pid"] == os.getpid())
+        assert me["ppid"] == os.getppid()
+        assert me["uid"] == str(os.getuid())
+        assert me["threads"] >= 1
+        assert me["mem_kb"] > 0
+
 
 class TestWhereis:
     def test_find_ls(self):
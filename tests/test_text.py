@@ -2,6 +2,7 @@
 
 import os
 import tempfile
+import threading
 import pytest
 import shellfast as sf
 
@@ -28,6 +29,13 @@ class TestCat:
             assert "1" in result
             assert "2" in result
 
+    def test_number_and_squeeze(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = create_file(tmpdir, "test.txt", "a\n\n \n\nb")
+            assert sf.cat(path) == "a\n\n \n\nb\n"
+            assert sf.cat(path, number_lines=True, squeeze_blank=True) == \
+                "     1\ta\n     2\t\n     3\tb\n"
+
     def test_nonexistent_raises(self):
         with pytest.raises(ValueError):
             sf.cat("/nonexistent_file_12345")
@@ -56,6 +64,13 @@ class TestHeadAndTail:
             result = sf.head(path, n=3)
             assert len(result.strip().split("\n")) == 3
 
+    def test_head_short_file_without_trailing_newline(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = create_file(tmpdir, "short.txt", "a\n\nb")
+            assert sf.head(path, n=2) == "a\n\n"
+            assert sf.head(path, n=10) == "a\n\nb\n"
+            assert sf.head(path, n=0) == ""
+
     def test_tail_default(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             lines = "\n".join(str(i) for i in range(20)) + "\n"
@@ -71,6 +86,13 @@ class TestHeadAndTail:
             result = sf.tail(path, n=5)
             assert len(result.strip().split("\n")) == 5
 
+    def test_tail_large_file_without_trailing_newline(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            lines = ["%06d %s" % (i, "x" * 50) for i in range(20000)]
+            path = create_file(tmpdir, "big.txt", "\n".join(lines))
+            assert sf.tail(path, n=3) == "\n".join(lines[-3:]) + "\n"
+            assert sf.tail(path, n=3000) == "\n".join(lines[-3000:]) + "\n"
+
 
 class TestGrep:
     def test_basic_match(self):
@@ -97,6 +119,108 @@ class TestGrep:
             result = sf.grep("a", path, count_only=True)
             assert isinstance(result, dict)
 
+    def test_literal_line_numbers_large_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            lines = ["filler line %d" % i for i in range(5000)]
+            lines[1234] = "an ERROR: disk full"
+            lines[4321] = "another error here"
+            path = create_file(tmpdir, "big.log", "\n".join(lines))
+            result = sf.grep("error", path, ignore_case=True)
+            assert [r["line_number"] for r in result] == [1235, 4322]
+            assert result[0]["line"] == "an ERROR: disk full"
+
+    def test_ignore_case_punctuation(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = create_file(tmpdir, "test.txt", "user@HOST\nuser`host\n")
+            result = sf.grep("@host", path, ignore_case=True)
+            assert [r["line"] for r in result] == ["user@HOST"]
+
+    def test_regex(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = create_file(tmpdir, "test.txt",
+                               "ERROR: timeout\nerror no\nInfo: Timeout error\n")
+            result = sf.grep("error.*timeout", path, ignore_case=True)
+            assert [r["line_number"] for r in result] == [1]
+            result = sf.grep("^[a-z]+ (no|yes)$", path)
+            assert [r["line"] for r in result] == ["error no"]
+
+    def test_regex_backreference(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = create_file(tmpdir, "test.txt", "abab\nabba\n")
+            result = sf.grep("(ab)\\1", path)
+            assert [r["line"] for r in result] == ["abab"]
+
+    def test_regex_with_required_literal(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            lines = ["request %d ok" % i for i in range(3000)]
+            lines[10] = "request 10 FAILED after 3 retries"
+            lines[2000] = "failed: request 2000 failed after retries"
+            path = create_file(tmpdir, "big.log", "\n".join(lines))
+            result = sf.grep("[0-9]+ failed after", path, ignore_case=True)
+            assert [r["line_number"] for r in result] == [11, 2001]
+            result = sf.grep("failed after [0-9]", path, ignore_case=True, invert=True,
+                             count_only=True)
+            assert list(result.values()) == [2999]
+
+    def test_regex_posix_class_before_literal(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = create_file(tmpdir, "test.txt", "5x\nab\nq=key\nzz\n")
+            assert [r["line"] for r in sf.grep("[[:digit:]]x", path)] == ["5x"]
+            assert [r["line"] for r in sf.grep("[[:alpha:]]b", path)] == ["ab"]
+            assert [r["line"] for r in sf.grep("[^[:space:]]=key", path)] == ["q=key"]
+
+    def test_many_patterns_from_threads(self):
+        # More distinct patterns than the compiled-pattern cache holds, from
+        # several threads at once.
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = create_file(tmpdir, "test.txt", "".join("id%d x\n" % i for i in range(300)))
+            failures = []
+
+            def worker(offset):
+                for i in range(300):
+                    pattern = "id%d[ ]x" % ((i * 7 + offset) % 300)
+                    if len(sf.grep(pattern, path)) != 1:
+                        failures.append(pattern)
+
+            threads = [threading.Thread(target=worker, args=(k,)) for k in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert failures == []
+
+
+class TestGrepMulti:
+    def test_matches_per_pattern(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = create_file(tmpdir, "app.log",
+                               "INFO start\nWARN disk\nERROR disk full\nINFO done\n")
+            result = sf.grep_multi(["error", "disk", "^INFO", "missing"], path,
+                                   ignore_case=True)
+            assert [r["line_number"] for r in result["error"]] == [3]
+            assert [r["line"] for r in result["disk"]] == ["WARN disk", "ERROR disk full"]
+            assert [r["line_number"] for r in result["^INFO"]] == [1, 4]
+            assert result["missing"] == []
+
+    def test_matches_never_span_lines(self):
+        # Patterns that could match a newline, and ones that can match
+        # nothing at all, must report the same lines as a line-by-line grep
+        # whichever backend scans them.
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = create_file(tmpdir, "test.txt", "xa\nbx\nxa b\n\nyy\n")
+            patterns = [r"a\sb", "a[^x]b", r"\W", "a.b", "^$", "y*$"]
+            result = sf.grep_multi(patterns, path)
+            assert [r["line_number"] for r in result[r"a\sb"]] == [3]
+            assert [r["line_number"] for r in result["a[^x]b"]] == [3]
+            assert [r["line_number"] for r in result[r"\W"]] == [3]
+            assert [r["line_number"] for r in result["a.b"]] == [3]
+            assert [r["line_number"] for r in result["^$"]] == [4]
+            assert [r["line_number"] for r in result["y*$"]] == [1, 2, 3, 4, 5]
+
+    def test_nonexistent_raises(self):
+        with pytest.raises(ValueError):
+            sf.grep_multi(["a"], "/nonexistent_file_12345")
+
 
 class TestSort:
     def test_basic_sort(self):
@@ -120,6 +244,24 @@ class TestSort:
             lines = result.strip().split("\n")
             assert lines == ["1", "2", "10", "100"]
 
+    def test_numeric_large_integers(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            values = [(i * 7919) % 5003 - 2500 for i in range(5003)]
+            values += [-(10 ** 17), 10 ** 17]
+            path = create_file(tmpdir, "test.txt", "\n".join(map(str, values)) + "\n")
+            result = sf.sort_file(path, numeric=True)
+            assert [int(v) for v in result.split()] == sorted(values)
+
+    def test_numeric_every_digit_count(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            values = []
+            for digits in range(1, 19):
+                v = int("9876543210123456789"[:digits])
+                values += [v, -v, v // 3]
+            path = create_file(tmpdir, "test.txt", "\n".join(map(str, values)) + "\n")
+            result = sf.sort_file(path, numeric=True)
+            assert [int(v) for v in result.split()] == sorted(values)
+
     def test_unique(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             path = create_file(tmpdir, "test.txt", "a\nb\na\nc\nb\n")
@@ -136,6 +278,14 @@ class TestDiff:
             result = sf.diff(f1, f2)
             assert "-" not in result.split("\n", 2)[-1] or "+" not in result
 
+    def test_changed_line(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            lines = ["line %d" % i for i in range(3000)]
+            f1 = create_file(tmpdir, "a.txt", "\n".join(lines) + "\n")
+            lines[1500] = "changed"
+            f2 = create_file(tmpdir, "b.txt", "\n".join(lines) + "\n")
+            assert sf.diff(f1, f2, unified=False) == "- line 1500\n+ changed\n"
+
 
 class TestCmp:
     def test_identical(self):
@@ -152,6 +302,25 @@ class TestCmp:
             result = sf.cmp(f1, f2)
             assert result["identical"] is False
 
+    def test_first_difference_large_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            content = "line of text\n" * 10000
+            changed = content[:100005] + "X" + content[100006:]
+            f1 = create_file(tmpdir, "a.txt", content)
+            f2 = create_file(tmpdir, "b.txt", changed)
+            result = sf.cmp(f1, f2)
+            assert result["byte_offset"] == 100006
+            assert result["line_number"] == 100005 // 13 + 1
+
+    def test_prefix(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            f1 = create_file(tmpdir, "a.txt", "ab\nc")
+            f2 = create_file(tmpdir, "b.txt", "ab\n")
+            result = sf.cmp(f1, f2)
+            assert result["identical"] is False
+            assert result["byte_offset"] == 4
+            assert result["line_number"] == 2
+
 
 class TestWc:
     def test_counts(self):
@@ -168,6 +337,15 @@ class TestWc:
             assert result["lines"] == 3
             assert "words" not in result
 
+    def test_counts_large_mixed_whitespace(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            content = "alpha\tbeta  gamma\r\n\x0bdelta\n" * 500 + "tail"
+            path = create_file(tmpdir, "test.txt", content)
+            result = sf.wc(path)
+            assert result["lines"] == 1000
+            assert result["words"] == 2001
+            assert result["bytes"] == len(content)
+
 
 class TestComm:
     def test_comm(self):
@@ -179,6 +357,15 @@ class TestComm:
             assert "d" in result["only_in_second"]
             assert "b" in result["in_both"]
 
+    def test_comm_unsorted_with_duplicates(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            f1 = create_file(tmpdir, "a.txt", "c\na\nb\na\n")
+            f2 = create_file(tmpdir, "b.txt", "d\nb\nb\n")
+            result = sf.comm(f1, f2)
+            assert result["only_in_first"] == ["a", "c"]
+            assert result["only_in_second"] == ["d"]
+            assert result["in_both"] == ["b"]
+
 
 class TestCut:
     def test_basic_cut(self):
@@ -187,3 +374,27 @@ class TestCut:
             result = sf.cut(path, delimiter=":", fields="2")
             lines = result.strip().split("\n")
             assert lines == ["b", "e"]
+
+    def test_cut_ranges_and_short_lines(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = create_file(tmpdir, "test.txt", "a,b,c,d\nx\n\ne,f,\ng,h")
+            result = sf.cut(path, delimiter=",", fields="3,1-2")
+            assert result == "a,b,c\nx\n\ne,f\ng,h\n"
+
+
+class TestCutArray:
+    def test_matches_cut(self):
+        pytest.importorskip("numpy")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            content = "".join("%d\tname%d\t%d\n" % (i, i, i * i) for i in range(1000))
+            content += "short\n\nlast\tone"
+            path = create_file(tmpdir, "test.tsv", content)
+            expected = sf.cut(path, fields="2").split("\n")[:-1]
+            assert sf.cut_array(path, field=2) == expected
+            assert sf.cut_array(content.encode(), "\t", 2) == expected
+            assert sf.cut_array(b"a,b\nc\n", ",", 1) == ["a", "c"]
+
+    def test_invalid_delimiter(self):
+        pytest.importorskip("numpy")
+        with pytest.raises(ValueError):
+            sf.cut_array(b"a,b", delimiter=",,")